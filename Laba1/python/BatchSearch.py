@@ -0,0 +1,212 @@
+import math
+
+import numpy as np
+
+from FibonacciMethod import fibonacci_ratio, required_n
+
+
+class BatchResult:
+    """
+    Результат одновременного поиска минимума для N независимых задач.
+
+    Attributes:
+        x (ndarray): Точки минимума (середины конечных интервалов), форма (N,).
+        fun (ndarray): Значения функций в точках минимума.
+        lower (ndarray): Левые границы конечных интервалов.
+        upper (ndarray): Правые границы конечных интервалов.
+        iterations (ndarray): Количество итераций для каждой задачи.
+        evaluations (ndarray): Количество вычислений функции для каждой задачи.
+        calls (int): Количество векторных вызовов функции.
+    """
+
+    __slots__ = ("x", "fun", "lower", "upper", "iterations", "evaluations", "calls")
+
+    def __init__(self, x, fun, lower, upper, iterations, evaluations, calls):
+        self.x = x
+        self.fun = fun
+        self.lower = lower
+        self.upper = upper
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.calls = calls
+
+    def __repr__(self):
+        return (f"BatchResult(problems={self.x.shape[0]}, max_iterations={self.iterations.max(initial=0)}, "
+                f"calls={self.calls})")
+
+
+class _BatchObjective:
+    """
+    Векторная целевая функция с подсчётом вычислений по задачам.
+
+    Если indexed=False, функция вызывается как function(x) для всех N точек сразу
+    (у завершённых задач в x повторяется уже вычисленная точка, её значение
+    не используется). Если indexed=True, функция вызывается как function(x, index)
+    только для точек активных задач с номерами index.
+    """
+
+    def __init__(self, function, size, indexed):
+        self.function = function
+        self.indexed = indexed
+        self.evaluations = np.zeros(size, dtype=int)
+        self.calls = 0
+
+    def __call__(self, x, active):
+        self.calls += 1
+        self.evaluations += active
+        if not self.indexed:
+            return np.asarray(self.function(x), dtype=float)
+        index = np.flatnonzero(active)
+        values = np.full(x.shape[0], np.nan)
+        values[index] = self.function(x[index], index)
+        return values
+
+
+def _prepare_bounds(lower, upper):
+    a = np.array(lower, dtype=float).ravel()
+    b = np.array(upper, dtype=float).ravel()
+    if a.shape != b.shape:
+        raise ValueError("Массивы левых и правых границ должны иметь одинаковую длину")
+    return a, b
+
+
+def _finish(objective, a, b, iterations):
+    x = (a + b) / 2
+    fun = objective(x, np.ones(x.shape[0], dtype=bool))
+    return BatchResult(x, fun, a, b, iterations, objective.evaluations, objective.calls)
+
+
+def batch_golden_section(function, lower, upper, epsilon=1e-5, max_iterations=None, indexed=False):
+    """
+    Метод золотого сечения сразу для N интервалов [lower_i, upper_i].
+
+    Все интервалы сокращаются синхронно, по одному векторному вызову функции
+    на итерацию; задачи, у которых длина интервала стала меньше epsilon,
+    замораживаются и дальше не меняются.
+
+    Args:
+        function: Векторная функция f(x) -> ndarray той же длины, где x[i] - точка i-й задачи.
+        lower (array_like): Левые границы интервалов.
+        upper (array_like): Правые границы интервалов.
+        epsilon (float): Требуемая длина конечных интервалов.
+        max_iterations (int): Ограничение на количество итераций.
+        indexed (bool): Вызывать function(x, index) только для активных задач.
+
+    Returns:
+        BatchResult: Точки минимума, значения и счётчики по задачам.
+    """
+    a, b = _prepare_bounds(lower, upper)
+    num_1 = (3 - math.sqrt(5)) / 2
+    num_2 = 1 - num_1
+    objective = _BatchObjective(function, a.shape[0], indexed)
+    iterations = np.zeros(a.shape[0], dtype=int)
+    active = np.abs(b - a) >= epsilon
+
+    y = a + num_1 * (b - a)
+    z = a + num_2 * (b - a)
+    fy = objective(y, active)
+    fz = objective(z, active)
+    k = 0
+    while active.any() and (max_iterations is None or k < max_iterations):
+        keep_left = active & (fy <= fz)
+        keep_right = active & ~keep_left
+        # [a, z]: y становится новой z; [y, b]: z становится новой y
+        np.copyto(b, z, where=keep_left)
+        np.copyto(a, y, where=keep_right)
+        np.copyto(z, y, where=keep_left)
+        np.copyto(fz, fy, where=keep_left)
+        np.copyto(y, z, where=keep_right)
+        np.copyto(fy, fz, where=keep_right)
+        np.copyto(y, a + num_1 * (b - a), where=keep_left)
+        np.copyto(z, a + num_2 * (b - a), where=keep_right)
+        probe = np.where(keep_left, y, z)
+        values = objective(probe, active)
+        np.copyto(fy, values, where=keep_left)
+        np.copyto(fz, values, where=keep_right)
+        iterations += active
+        active &= np.abs(b - a) >= epsilon
+        k += 1
+    return _finish(objective, a, b, iterations)
+
+
+def batch_fibonacci(function, lower, upper, epsilon=1e-5, n=None, delta=None, indexed=False):
+    """
+    Метод Фибоначчи сразу для N интервалов [lower_i, upper_i].
+
+    Все задачи идут по общему расписанию отношений F_{k-1} / F_k, n выбирается
+    по самому длинному интервалу. Задачи, у которых длина интервала стала
+    меньше epsilon, замораживаются раньше остальных.
+
+    Args:
+        function: Векторная функция f(x) -> ndarray той же длины, где x[i] - точка i-й задачи.
+        lower (array_like): Левые границы интервалов.
+        upper (array_like): Правые границы интервалов.
+        epsilon (float): Требуемая длина конечных интервалов.
+        n (int): Количество чисел Фибоначчи (по умолчанию минимально достаточное).
+        delta (float): Константа различимости для последнего шага (по умолчанию epsilon / 100).
+        indexed (bool): Вызывать function(x, index) только для активных задач.
+
+    Returns:
+        BatchResult: Точки минимума, значения и счётчики по задачам.
+    """
+    a, b = _prepare_bounds(lower, upper)
+    delta = epsilon / 100 if delta is None else delta
+    if n is None:
+        n = required_n(np.abs(b - a).max(initial=0.0), epsilon, delta)
+    objective = _BatchObjective(function, a.shape[0], indexed)
+    iterations = np.zeros(a.shape[0], dtype=int)
+    active = np.abs(b - a) >= epsilon
+
+    ratio = fibonacci_ratio(n)
+    lam = a + (1 - ratio) * (b - a)
+    mu = a + ratio * (b - a)
+    if n == 2:
+        mu = lam + delta
+    f_lam = objective(lam, active)
+    f_mu = objective(mu, active)
+    for i in range(1, n):
+        if not active.any():
+            break
+        keep_right = active & (f_lam > f_mu)
+        keep_left = active & ~keep_right
+        np.copyto(a, lam, where=keep_right)
+        np.copyto(b, mu, where=keep_left)
+        iterations += active
+        if i + 1 <= n - 1:
+            np.copyto(lam, mu, where=keep_right)
+            np.copyto(f_lam, f_mu, where=keep_right)
+            np.copyto(mu, lam, where=keep_left)
+            np.copyto(f_mu, f_lam, where=keep_left)
+            if i + 1 == n - 1:
+                new_mu = lam + delta
+                new_lam = mu - delta
+            else:
+                ratio = fibonacci_ratio(n - i)
+                new_mu = a + ratio * (b - a)
+                new_lam = a + (1 - ratio) * (b - a)
+            np.copyto(mu, new_mu, where=keep_right)
+            np.copyto(lam, new_lam, where=keep_left)
+            values = objective(np.where(keep_right, mu, lam), active)
+            np.copyto(f_mu, values, where=keep_right)
+            np.copyto(f_lam, values, where=keep_left)
+        active &= np.abs(b - a) >= epsilon
+    return _finish(objective, a, b, iterations)
+
+
+def main():
+    # Пример: 10000 квадратичных задач с разными точками минимума
+    centers = np.linspace(-3, 3, 10000)
+    function = lambda x: (x - centers) ** 2 + 1
+    lower = np.full(centers.shape, -4.0)
+    upper = np.full(centers.shape, 6.0)
+    for name, search in (("золотое сечение", batch_golden_section), ("Фибоначчи", batch_fibonacci)):
+        result = search(function, lower, upper, epsilon=1e-6)
+        print(f"Метод: {name}")
+        print("Количество задач:", centers.shape[0])
+        print("Максимальная ошибка:", np.abs(result.x - centers).max())
+        print("Векторных вызовов функции:", result.calls)
+        print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+import numpy as np
+
+from ScalarMinimizer import minimize_scalar
+
+
+def cheap_quadratic(x):
+    """Дешёвая функция из лабораторной работы."""
+    return 3 * x ** 2 - x + 4
+
+
+def expensive_series(x):
+    """Дорогая функция: минимум в 0.7, каждое вычисление суммирует 2000 слагаемых."""
+    return math.log(1 + sum((x - 0.7) ** 2 / k ** 2 for k in range(1, 2001)))
+
+
+def narrow_valley(x):
+    """Узкая впадина шириной около 1e-3 в точке 0.3."""
+    return -1 / (1 + ((x - 0.3) / 1e-3) ** 2)
+
+
+def flat_bottom(x):
+    """Очень пологий минимум в точке 1.5."""
+    return (x - 1.5) ** 8
+
+
+def kink(x):
+    """Негладкий минимум в точке 0.4."""
+    return abs(x - 0.4)
+
+
+# Набор унимодальных тестовых функций: имя -> (функция, интервал, точный минимум)
+CATALOG = {
+    "cheap_quadratic": (cheap_quadratic, [-4.0, 6.0], 1 / 6),
+    "expensive_series": (expensive_series, [-3.0, 4.0], 0.7),
+    "narrow_valley": (narrow_valley, [-2.0, 2.0], 0.3),
+    "flat_bottom": (flat_bottom, [-3.0, 4.0], 1.5),
+    "kink": (kink, [-2.0, 3.0], 0.4),
+}
+
+DEFAULT_METHODS = ("dichotomy", "golden", "fibonacci")
+DEFAULT_EPSILONS = (1e-2, 1e-4, 1e-6, 1e-8)
+
+
+def run_case(name, method, epsilon, repeat):
+    """
+    Запускает один метод на одной функции и возвращает запись с результатами.
+
+    Время - минимальное по repeat запускам, чтобы уменьшить влияние шума.
+    """
+    function, interval, exact = CATALOG[name]
+    best_time = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = minimize_scalar(function, interval, method, epsilon)
+        best_time = min(best_time, time.perf_counter() - start)
+    return {
+        "function": name,
+        "method": method,
+        "epsilon": epsilon,
+        "time_s": best_time,
+        "evaluations": result.evaluations,
+        "iterations": result.iterations,
+        "width": abs(result.interval[1] - result.interval[0]),
+        "x": result.x,
+        "error": abs(result.x - exact),
+    }
+
+
+def run_suite(functions, methods, epsilons, repeat):
+    """
+    Прогоняет все сочетания функций, методов и точностей.
+    """
+    results = []
+    for name in functions:
+        for method in methods:
+            for epsilon in epsilons:
+                results.append(run_case(name, method, epsilon, repeat))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, time_tolerance):
+    """
+    Сравнивает результаты с сохранённым отчётом.
+
+    Регрессией считается рост числа вычислений функции или рост времени
+    больше, чем в time_tolerance раз.
+
+    Returns:
+        list: Строки с описанием найденных регрессий.
+    """
+    key = lambda row: (row["function"], row["method"], row["epsilon"])
+    previous = {key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+        if row["evaluations"] > old["evaluations"]:
+            regressions.append(f"{key(row)}: вычислений {old['evaluations']} -> {row['evaluations']}")
+        if row["time_s"] > time_tolerance * old["time_s"]:
+            regressions.append(f"{key(row)}: время {old['time_s']:.3g} с -> {row['time_s']:.3g} с")
+    return regressions
+
+
+def print_table(report):
+    """
+    Выводит результаты в виде таблицы.
+    """
+    print(f"{'функция':<18}{'метод':<11}{'epsilon':>9}{'время, мс':>12}{'вычисл.':>9}{'ширина':>12}{'ошибка':>12}")
+    for row in report["results"]:
+        print(f"{row['function']:<18}{row['method']:<11}{row['epsilon']:>9.0e}{row['time_s'] * 1e3:>12.3f}"
+              f"{row['evaluations']:>9}{row['width']:>12.3e}{row['error']:>12.3e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк одномерных методов из Laba1")
+    parser.add_argument("--functions", nargs="+", choices=sorted(CATALOG), default=list(CATALOG))
+    parser.add_argument("--methods", nargs="+", choices=("dichotomy", "golden", "fibonacci", "brent"),
+                        default=list(DEFAULT_METHODS))
+    parser.add_argument("--epsilons", nargs="+", type=float, default=list(DEFAULT_EPSILONS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для сохранения отчёта в JSON")
+    parser.add_argument("--compare", help="отчёт предыдущей версии для поиска регрессий")
+    parser.add_argument("--time-tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.functions, args.methods, args.epsilons, args.repeat)
+    print_table(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=1)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.time_tolerance)
+        for line in regressions:
+            print("Регрессия:", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
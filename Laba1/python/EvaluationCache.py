@@ -0,0 +1,125 @@
+import asyncio
+from collections import OrderedDict
+
+
+class EvaluationCache:
+    """
+    Кэш значений целевой функции одной переменной с ограниченным размером.
+
+    При переполнении вытесняется значение, к которому дольше всего не
+    обращались (LRU). Счётчики попаданий и промахов считаются за один запуск
+    метода и сбрасываются через reset_counters().
+
+    Attributes:
+        function (callable): Целевая функция f(x) -> float.
+        maxsize (int): Максимальное количество хранимых значений.
+        hits (int): Количество обращений, обслуженных из кэша.
+        misses (int): Количество реальных вычислений функции.
+    """
+
+    def __init__(self, function, maxsize=256):
+        if maxsize < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.function = function
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+
+    def __call__(self, x):
+        """
+        Возвращает f(x), вычисляя функцию только если значения нет в кэше.
+        """
+        x = float(x)
+        values = self._values
+        if x in values:
+            values.move_to_end(x)
+            self.hits += 1
+            return values[x]
+        value = self.function(x)
+        self._store(x, value)
+        return value
+
+    def _store(self, x, value):
+        """
+        Сохраняет новое значение, вытесняя самое старое при переполнении.
+        """
+        values = self._values
+        self.misses += 1
+        values[x] = value
+        if len(values) > self.maxsize:
+            values.popitem(last=False)
+
+    def _split(self, points):
+        """
+        Разделяет точки на найденные в кэше и недостающие (без повторов).
+
+        Returns:
+            tuple: Словарь известных значений и список точек, которые нужно вычислить.
+        """
+        known = {}
+        missing = []
+        for x in points:
+            if x in self._values:
+                self._values.move_to_end(x)
+                self.hits += 1
+                known[x] = self._values[x]
+            elif x not in missing:
+                missing.append(x)
+        return known, missing
+
+    def evaluate_pair(self, x1, x2, executor=None):
+        """
+        Возвращает f(x1) и f(x2), вычисляя недостающие значения одновременно.
+
+        Args:
+            x1, x2: Точки, в которых нужно значение функции.
+            executor: Пул потоков или процессов (concurrent.futures.Executor).
+                Если не задан, точки вычисляются последовательно.
+        """
+        if executor is None:
+            return self(x1), self(x2)
+        x1, x2 = float(x1), float(x2)
+        known, missing = self._split((x1, x2))
+        futures = [(x, executor.submit(self.function, x)) for x in missing]
+        for x, future in futures:
+            known[x] = future.result()
+            self._store(x, known[x])
+        return known[x1], known[x2]
+
+    async def evaluate_pair_async(self, x1, x2, executor=None):
+        """
+        Асинхронный вариант evaluate_pair: точки вычисляются как задачи asyncio.
+
+        Если функция - корутина, она вызывается напрямую, иначе выполняется
+        в executor (по умолчанию - в пуле потоков цикла событий).
+        """
+        x1, x2 = float(x1), float(x2)
+        known, missing = self._split((x1, x2))
+        if asyncio.iscoroutinefunction(self.function):
+            results = await asyncio.gather(*(self.function(x) for x in missing))
+        else:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*(loop.run_in_executor(executor, self.function, x) for x in missing))
+        for x, value in zip(missing, results):
+            known[x] = value
+            self._store(x, value)
+        return known[x1], known[x2]
+
+    @property
+    def evaluations(self):
+        """Количество реальных вычислений функции за текущий запуск."""
+        return self.misses
+
+    def reset_counters(self):
+        """Обнуляет счётчики попаданий и промахов, сохраняя значения."""
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Очищает кэш и счётчики."""
+        self._values.clear()
+        self.reset_counters()
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,202 @@
+import ast
+import types
+from functools import lru_cache
+
+import numpy as np
+
+# Разрешённые в выражениях функции и константы. Используются версии из numpy,
+# поэтому одно и то же выражение считается и для числа, и для целого массива.
+_SAFE_FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "arcsin": np.arcsin,
+    "arccos": np.arccos,
+    "arctan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "log2": np.log2,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "fabs": np.abs,
+    "pow": np.power,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+    "pi": np.pi,
+    "e": np.e,
+}
+
+# Псевдонимы модулей, через которые функции можно вызывать в старом стиле
+# (например, "mt.sin(x)" или "np.exp(x)").
+_MODULE_ALIASES = ("np", "math", "mt")
+
+_NAMESPACE = dict(_SAFE_FUNCTIONS)
+_NAMESPACE.update({alias: types.SimpleNamespace(**_SAFE_FUNCTIONS) for alias in _MODULE_ALIASES})
+_NAMESPACE["__builtins__"] = {}
+
+
+@lru_cache(maxsize=1)
+def _symbolic_namespace():
+    """
+    Пространство имён для вычисления выражения от символов sympy (те же имена, что в _SAFE_FUNCTIONS).
+    """
+    import sympy as sp
+    functions = {
+        "sin": sp.sin, "cos": sp.cos, "tan": sp.tan,
+        "asin": sp.asin, "acos": sp.acos, "atan": sp.atan,
+        "arcsin": sp.asin, "arccos": sp.acos, "arctan": sp.atan,
+        "sinh": sp.sinh, "cosh": sp.cosh, "tanh": sp.tanh,
+        "exp": sp.exp, "log": sp.log,
+        "log10": lambda a: sp.log(a, 10), "log2": lambda a: sp.log(a, 2),
+        "sqrt": sp.sqrt, "abs": sp.Abs, "fabs": sp.Abs, "pow": sp.Pow,
+        "minimum": sp.Min, "maximum": sp.Max,
+        "pi": sp.pi, "e": sp.E,
+    }
+    namespace = dict(functions)
+    namespace.update({alias: types.SimpleNamespace(**functions) for alias in _MODULE_ALIASES})
+    namespace["__builtins__"] = {}
+    return namespace
+
+
+def _is_symbolic(x):
+    """Проверяет, передан ли вектор символов sympy (так его передаёт AutoGrad)."""
+    return isinstance(x, (tuple, list)) and any(hasattr(item, "free_symbols") for item in x)
+
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Attribute, ast.Subscript, ast.Compare, ast.IfExp, ast.BoolOp,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd, ast.Not, ast.And, ast.Or,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+
+class CompiledExpression:
+    """
+    Скомпилированное строковое выражение от переменной x.
+
+    Attributes:
+        text (str): Исходная строка выражения.
+        code: Скомпилированный байт-код выражения.
+    """
+
+    __slots__ = ("text", "code")
+
+    def __init__(self, text, code):
+        self.text = text
+        self.code = code
+
+    def __call__(self, x):
+        """
+        Вычисляет выражение для числа или массива x.
+        """
+        result = eval(self.code, _NAMESPACE, {"x": x})
+        if np.ndim(x) > 0 and np.ndim(result) == 0:
+            # Выражение не зависит от x (например, "5"), а ждут массив значений
+            return np.full(np.shape(x), result, dtype=float)
+        return result
+
+    def __reduce__(self):
+        # Байт-код не сериализуется, поэтому при передаче в другой процесс
+        # выражение заново компилируется по тексту.
+        return compile_expression, (self.text,)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+class VectorExpression(CompiledExpression):
+    """
+    Скомпилированное строковое выражение от вектора x (через x[0], x[1], ...).
+
+    В отличие от CompiledExpression, постоянное выражение растягивается не до формы
+    x, а до формы массива точек x.shape[1:] (первая ось - координаты). Для вектора
+    символов sympy функции берутся из sympy, так что выражение можно дифференцировать.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, x):
+        """
+        Вычисляет выражение для вектора или массива точек x (или для вектора символов sympy).
+        """
+        if _is_symbolic(x):
+            return eval(self.code, _symbolic_namespace(), {"x": x})
+        result = eval(self.code, _NAMESPACE, {"x": x})
+        if np.ndim(x) > 1 and np.ndim(result) == 0:
+            return np.full(np.shape(x)[1:], result, dtype=float)
+        return result
+
+    def __reduce__(self):
+        return compile_vector_expression, (self.text,)
+
+    def __repr__(self):
+        return f"VectorExpression({self.text!r})"
+
+
+def _validate(tree, text):
+    """
+    Проверяет, что выражение использует только x и безопасные функции.
+    """
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Недопустимая конструкция {type(node).__name__} в выражении: {text}")
+        if isinstance(node, ast.Name) and node.id != "x" and node.id not in _NAMESPACE:
+            raise ValueError(f"Неизвестное имя '{node.id}' в выражении: {text}")
+        if isinstance(node, ast.Attribute):
+            if not (isinstance(node.value, ast.Name) and node.value.id in _MODULE_ALIASES
+                    and node.attr in _SAFE_FUNCTIONS):
+                raise ValueError(f"Недопустимое обращение к атрибуту '{node.attr}' в выражении: {text}")
+
+
+def _compile(text):
+    """
+    Разбирает выражение, проверяет его и возвращает байт-код.
+    """
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as error:
+        raise ValueError(f"Некорректное выражение: {text}") from error
+    _validate(tree, text)
+    return compile(tree, "<expression>", "eval")
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """
+    Разбирает и компилирует строковое выражение один раз.
+
+    Результат кэшируется по тексту выражения, поэтому повторные вызовы
+    с той же строкой не разбирают её заново.
+
+    Args:
+        text (str): Строковое представление функции от x, например "3*x**2 - x + 4".
+
+    Returns:
+        CompiledExpression: Вызываемый объект f(x).
+    """
+    return CompiledExpression(text, _compile(text))
+
+
+@lru_cache(maxsize=256)
+def compile_vector_expression(text):
+    """
+    Разбирает и компилирует выражение от вектора x, например "x[0]**2 + 8*x[1]**2".
+
+    Args:
+        text (str): Строковое представление функции от вектора x.
+
+    Returns:
+        VectorExpression: Вызываемый объект f(x) для вектора формы (n,) или массива
+            точек формы (n, ...); для вектора символов sympy он строит выражение sympy
+            (с функциями sympy вместо numpy), поэтому подходит для AutoGrad.
+    """
+    return VectorExpression(text, _compile(text))
@@ -2,91 +2,186 @@ import math as mt
 import matplotlib.pyplot as plt
 import numpy as np
 
+from EvaluationCache import EvaluationCache
+from ExpressionEngine import compile_expression
+
+# Общие для всех экземпляров таблицы: числа Фибоначчи F_0 = F_1 = 1, F_k = F_{k-1} + F_{k-2}
+# (хранятся как float, чтобы не работать с длинными целыми) и отношения F_{k-1} / F_k.
+_FIB_NUMBERS = [1.0, 1.0]
+_FIB_RATIOS = [0.0, 1.0]
+
+
+def _extend_fibonacci_tables(n):
+    """
+    Дополняет общие таблицы до индекса n включительно.
+    """
+    for _ in range(len(_FIB_RATIOS), n + 1):
+        _FIB_NUMBERS.append(_FIB_NUMBERS[-1] + _FIB_NUMBERS[-2])
+        _FIB_RATIOS.append(1 / (1 + _FIB_RATIOS[-1]))
+
+
+def fibonacci_numbers(n):
+    """
+    Возвращает числа Фибоначчи F_0, ..., F_{n-1} из общей таблицы.
+    """
+    _extend_fibonacci_tables(n)
+    return _FIB_NUMBERS[:n]
+
+
+def fibonacci_ratio(k):
+    """
+    Возвращает отношение F_{k-1} / F_k из общей таблицы.
+    """
+    _extend_fibonacci_tables(k)
+    return _FIB_RATIOS[k]
+
+
+def required_n(length, epsilon, delta=0.0):
+    """
+    Находит минимальное n, при котором F_n >= length / (epsilon - delta).
+
+    При таком n конечный интервал неопределённости length / F_n + delta
+    не превышает epsilon.
+    """
+    if not 0 <= delta < epsilon:
+        raise ValueError("Должно выполняться 0 <= delta < epsilon")
+    target = abs(length) / (epsilon - delta)
+    n = 2
+    _extend_fibonacci_tables(n)
+    while _FIB_NUMBERS[n] < target:
+        n += 1
+        _extend_fibonacci_tables(n)
+    return n
+
+
 class FibonacciMethod:
-    def __init__(self, func, interval, epsilon=0.5, n=10):
+    def __init__(self, func, interval, epsilon=0.5, n=None, cache=None, delta=None, executor=None, hook=None):
         """
         Класс для метода Фибоначчи поиска минимума функции на заданном интервале.
 
         Args:
-            func (str): Строковое представление функции.
+            func (str | callable): Строковое представление функции или функция f(x).
             interval (list): Интервал для поиска минимума [a, b].
             epsilon (float): Точность поиска минимума.
-            n (int): Количество чисел Фибоначчи для метода.
+            n (int): Количество чисел Фибоначчи для метода. Если не задано,
+                выбирается минимальное n, обеспечивающее точность epsilon.
+            cache (EvaluationCache): Кэш значений функции; если не задан, создаётся собственный.
+            delta (float): Константа различимости для последнего шага (по умолчанию epsilon / 100).
+            executor: Пул потоков или процессов для одновременного вычисления функции
+                в начальных точках lambda и mu.
+            hook: Объект для сбора метрик (например, Recorder из Service/Instrumentation.py)
+                с методами start, iteration и finish; если не задан, метрики не собираются.
 
         Attributes:
-            func (str): Строковое представление функции.
+            func (str | callable): Строковое представление функции или функция f(x).
             interval (list): Интервал для поиска минимума [a, b].
             epsilon (float): Точность поиска минимума.
             n (int): Количество чисел Фибоначчи для метода.
-            fib_list (list): Список чисел Фибоначчи.
+            delta (float): Константа различимости для последнего шага.
+            fib_list (list): Список чисел Фибоначчи F_0, ..., F_n.
+            cache (EvaluationCache): Кэш значений функции со счётчиками вычислений.
+            trace: Объект с методом record(a, b) для записи интервалов по итерациям или None.
         """
         self.func = func
         self.interval = interval
         self.epsilon = epsilon
-        self.n = n
-        self.fib_list = self._calculate_fibonacci_numbers()
-
-    def _calculate_fibonacci_numbers(self):
-        """
-        Вычисляет числа Фибоначчи до заданного количества n.
-        """
-        fib_list = [1, 1]
-        for i in range(2, self.n):
-            fib_list.append(fib_list[i - 1] + fib_list[i - 2])
-        return fib_list
+        self.delta = epsilon / 100 if delta is None else delta
+        self.n = n if n is not None else required_n(interval[1] - interval[0], epsilon, self.delta)
+        if self.n < 2:
+            raise ValueError("Количество чисел Фибоначчи n должно быть не меньше 2")
+        self.fib_list = fibonacci_numbers(self.n + 1)
+        self._compiled = compile_expression(func) if isinstance(func, str) else func
+        self.cache = cache if cache is not None else EvaluationCache(self._compiled)
+        self.executor = executor
+        self.hook = hook
+        self.trace = None
 
     def _function(self, x):
         """
-        Вычисляет значение функции для заданного x.
+        Вычисляет значение функции для заданного x (числа или массива numpy).
         """
-        return eval(self.func)
+        if np.ndim(x) > 0 and not isinstance(self.func, str):
+            return np.array([self._compiled(value) for value in x])
+        return self._compiled(x)
 
     def calculate_lambda_mu(self, l, i):
         """
         Рассчитывает значения lambda_i и mu_i для заданного интервала и итерации.
+
+        На последней итерации (i = n - 1) точки совпадают, поэтому mu_i
+        смещается на константу различимости delta.
         """
-        n = len(self.fib_list)
-        lambda_i = l[0] + ((self.fib_list[(n - 1) - i - 1] / self.fib_list[(n - 1) - i + 1]) * (l[1] - l[0]))
-        mu_i = l[0] + ((self.fib_list[(n - 1) - i] / self.fib_list[(n - 1) - i + 1]) * (l[1] - l[0]))
+        ratio = fibonacci_ratio(self.n - i + 1)
+        lambda_i = l[0] + (1 - ratio) * (l[1] - l[0])
+        mu_i = l[0] + ratio * (l[1] - l[0])
+        if i == self.n - 1:
+            mu_i = lambda_i + self.delta
         return lambda_i, mu_i
 
-
-    def calculate_new_interval(self, lambda_i, mu_i, l):
+    def calculate_new_interval(self, lambda_i, mu_i, f_lambda_i, f_mu_i, l, i):
         """
         Переопределяет интервал неопределённости на основе lambda_i и mu_i.
-        """
-        f_lambda_i = self._function(lambda_i)
-        f_mu_i = self._function(mu_i)
-        return [lambda_i, l[1]] if f_lambda_i > f_mu_i else [l[0], mu_i]
 
-    def calculate_accuracy(self, l):
-        """
-        Рассчитывает точность текущего интервала неопределённости.
-        """
-        return abs(l[1] - l[0]) < self.epsilon
+        Оставшаяся внутри интервала точка переносится на следующую итерацию
+        вместе со значением функции, поэтому вычисляется только одна новая точка.
+
+        Returns:
+            tuple: Новый интервал, точки lambda и mu следующей итерации и значения функции в них.
+        """
+        if f_lambda_i > f_mu_i:
+            l = [lambda_i, l[1]]
+            if i + 1 > self.n - 1:
+                return l, None, None, None, None
+            lambda_i, f_lambda_i = mu_i, f_mu_i
+            _, mu_i = self.calculate_lambda_mu(l, i + 1)
+            if i + 1 == self.n - 1:
+                mu_i = lambda_i + self.delta
+            f_mu_i = self.cache(mu_i)
+        else:
+            l = [l[0], mu_i]
+            if i + 1 > self.n - 1:
+                return l, None, None, None, None
+            mu_i, f_mu_i = lambda_i, f_lambda_i
+            lambda_i, _ = self.calculate_lambda_mu(l, i + 1)
+            if i + 1 == self.n - 1:
+                lambda_i = mu_i - self.delta
+            f_lambda_i = self.cache(lambda_i)
+        return l, lambda_i, mu_i, f_lambda_i, f_mu_i
 
     def find_minimum(self):
         """
         Находит минимум функции на заданном интервале с использованием метода Фибоначчи.
+
+        Выполняет n - 1 сокращений интервала и n + 1 вычислений функции
+        (включая значение в найденной точке минимума).
         """
+        self.cache.reset_counters()
+        if self.hook is not None:
+            self.hook.start("fibonacci")
         l = self.interval
-        i = 1
-        while not self.calculate_accuracy(l):
-            lambda_i, mu_i = self.calculate_lambda_mu(l, i)
-            l = self.calculate_new_interval(lambda_i, mu_i, l)
-            i += 1
+        lambda_i, mu_i = self.calculate_lambda_mu(l, 1)
+        f_lambda_i, f_mu_i = self.cache.evaluate_pair(lambda_i, mu_i, self.executor)
+        for i in range(1, self.n):
+            l, lambda_i, mu_i, f_lambda_i, f_mu_i = self.calculate_new_interval(
+                lambda_i, mu_i, f_lambda_i, f_mu_i, l, i)
+            if self.trace is not None:
+                self.trace.record(l[0], l[1])
+            if self.hook is not None:
+                self.hook.iteration(i, evaluations=self.cache.evaluations)
 
         min_point = (l[1] + l[0]) / 2  # Находим середину последнего интервала
-        min_value = self._function(min_point)
+        min_value = self.cache(min_point)
+        if self.hook is not None:
+            self.hook.finish(iterations=self.n - 1, evaluations=self.cache.evaluations)
         self.interval = l 
-        return min_point, min_value, i - 1  # Возвращаем также количество итераций
+        return min_point, min_value, self.n - 1  # Возвращаем также количество итераций
 
     def plot_function(self):
         """
         Строит график функции и отмечает найденный минимум.
         """
         x_range = np.linspace(self.interval[0], self.interval[1], 1000)
-        plt.plot(x_range, [self._function(x) for x in x_range], label="f(x)", color="orange")
+        plt.plot(x_range, self._function(x_range), label="f(x)", color="orange")
         min_x, min_y, iterations = self.find_minimum()
         plt.scatter(min_x, min_y, color="red", s=20, label="Minimum")
         plt.xlabel("X")
@@ -119,6 +214,7 @@ def main():
     print("Точка минимума: " + str(min_x))
     print("Значение функции в точке минимума: " + str(min_y))
     print("Конечное k: " + str(iterations))
+    print("Количество вычислений функции: " + str(fibonacci.cache.evaluations))
     print("Точность (epsilon): " + str(abs(fibonacci.interval[1] - fibonacci.interval[0])))
     print("-----------------------------------------")
 
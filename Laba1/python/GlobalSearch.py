@@ -0,0 +1,210 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from ScalarMinimizer import minimize_scalar
+
+GLOBAL_METHODS = ("golden", "fibonacci", "brent")
+
+
+class GlobalResult:
+    """
+    Результат глобального поиска по нескольким подынтервалам.
+
+    Attributes:
+        x (float): Лучшая найденная точка минимума.
+        fun (float): Значение функции в ней.
+        evaluations (int): Общее количество вычислений функции (с учётом разбиения).
+        bracket (list): Подынтервал, в котором найден лучший минимум.
+        results (list): Результаты ScalarResult по всем выполненным подынтервалам.
+        pruned (int): Количество подынтервалов, отброшенных без поиска.
+    """
+
+    __slots__ = ("x", "fun", "evaluations", "bracket", "results", "pruned")
+
+    def __init__(self, x, fun, evaluations, bracket, results, pruned):
+        self.x = x
+        self.fun = fun
+        self.evaluations = evaluations
+        self.bracket = bracket
+        self.results = results
+        self.pruned = pruned
+
+    def __repr__(self):
+        return (f"GlobalResult(x={self.x!r}, fun={self.fun!r}, evaluations={self.evaluations}, "
+                f"searched={len(self.results)}, pruned={self.pruned})")
+
+
+def _budget_options(method, budget):
+    """
+    Переводит бюджет вычислений на один подынтервал в параметры метода.
+
+    Фибоначчи и Брент тратят сверх n (max_iterations) одно вычисление на значение
+    в найденной точке; золотое сечение учитывает его в max_evaluations само.
+    """
+    if budget is None:
+        return {}
+    if budget < 3:
+        raise ValueError("На каждый подынтервал должно приходиться не меньше 3 вычислений функции")
+    if method == "golden":
+        return {"max_evaluations": budget}
+    if method == "fibonacci":
+        return {"n": budget - 1}
+    return {"max_iterations": budget - 1}
+
+
+def _search_bracket(function, bracket, method, epsilon, options):
+    """
+    Поиск минимума на одном подынтервале (выполняется в процессе пула).
+    """
+    return minimize_scalar(function, bracket, method, epsilon, **options)
+
+
+def lower_bounds(grid, values, lipschitz):
+    """
+    Нижние оценки функции на подынтервалах сетки при константе Липшица lipschitz.
+
+    Для отрезка [x_i, x_{i+1}] оценка равна (f_i + f_{i+1}) / 2 - L * (x_{i+1} - x_i) / 2.
+    """
+    return (values[:-1] + values[1:]) / 2 - lipschitz * np.diff(grid) / 2
+
+
+def global_minimize(function, interval, brackets=8, method="golden", epsilon=1e-5,
+                    max_evaluations=None, workers=None, executor=None, lipschitz=None, lipschitz_factor=None):
+    """
+    Ищет глобальный минимум многоэкстремальной функции на интервале.
+
+    Интервал делится на brackets равных частей, на каждой одномерный метод
+    запускается в пуле процессов (одновременно - не больше workers подынтервалов),
+    лучший результат возвращается. Подынтервалы запускаются в порядке возрастания
+    значений функции на их концах.
+
+    Бюджет max_evaluations общий: подынтервал при запуске получает поровну из
+    остатка на ещё не начатые подынтервалы, а вычисления, не потраченные
+    завершившимся или отброшенным подынтервалом, достаются следующим.
+
+    Если задана константа Липшица (lipschitz или lipschitz_factor), ещё не начатый
+    подынтервал отбрасывается, когда его нижняя оценка не меньше лучшего найденного
+    значения. По умолчанию отсечения нет: оценка L по сетке (lipschitz_factor)
+    занижает константу на функциях с узкими минимумами, и тогда может быть отброшен
+    подынтервал с глобальным минимумом.
+
+    Args:
+        function: Функция f(x) или её строковое представление. Для пула процессов
+            функция должна сериализоваться через pickle (строка или функция модуля).
+        interval (list): Интервал поиска [a, b].
+        brackets (int): Количество подынтервалов K.
+        method (str): Локальный метод: "golden", "fibonacci" или "brent".
+        epsilon (float): Точность локального поиска.
+        max_evaluations (int): Общий бюджет вычислений функции на весь поиск.
+        workers (int): Количество процессов пула и одновременно выполняемых подынтервалов
+            (по умолчанию - число ядер).
+        executor: Готовый пул (concurrent.futures.Executor) вместо нового пула процессов.
+        lipschitz (float): Известная константа Липшица функции на интервале.
+        lipschitz_factor (float): Множитель для константы Липшица, оценённой по K + 1 точкам
+            сетки (используется, если lipschitz не задана; эвристика, см. выше).
+
+    Returns:
+        GlobalResult: Лучшая точка, значение и статистика поиска.
+    """
+    if method not in GLOBAL_METHODS:
+        raise ValueError(f"Неизвестный метод '{method}', доступны: {', '.join(GLOBAL_METHODS)}")
+    if brackets < 1:
+        raise ValueError("Количество подынтервалов должно быть положительным")
+    # Вычисления, ещё не потраченные и не выделенные запущенным подынтервалам
+    remaining = None
+    if max_evaluations is not None:
+        remaining = max_evaluations - (brackets + 1)
+        _budget_options(method, remaining // brackets)
+    slots = workers or os.cpu_count() or 1
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        grid = np.linspace(interval[0], interval[1], brackets + 1)
+        values = np.fromiter(executor.map(_evaluate_point, [function] * len(grid), grid), dtype=float,
+                             count=len(grid))
+        evaluations = len(grid)
+
+        if lipschitz is None and lipschitz_factor is not None and brackets > 1:
+            lipschitz = lipschitz_factor * np.abs(np.diff(values) / np.diff(grid)).max()
+        if lipschitz is None:
+            bounds = np.full(brackets, -np.inf)
+        else:
+            bounds = lower_bounds(grid, values, lipschitz)
+
+        waiting = deque(int(i) for i in np.argsort(np.minimum(values[:-1], values[1:])))
+        # Лучшее значение на сетке - тоже реально вычисленная точка, поэтому
+        # им можно отсекать подынтервалы ещё до первых результатов
+        threshold = float(values.min())
+        pending = {}
+        results = []
+        brackets_done = []
+        pruned = 0
+        while waiting or pending:
+            while waiting and len(pending) < slots:
+                i = waiting.popleft()
+                if bounds[i] >= threshold:
+                    pruned += 1
+                    continue
+                share = None
+                if remaining is not None:
+                    share = remaining // (len(waiting) + 1)
+                    remaining -= share
+                bracket = [float(grid[i]), float(grid[i + 1])]
+                future = executor.submit(_search_bracket, function, bracket, method, epsilon,
+                                         _budget_options(method, share))
+                pending[future] = (bracket, share)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                bracket, share = pending.pop(future)
+                result = future.result()
+                results.append(result)
+                brackets_done.append(bracket)
+                evaluations += result.evaluations
+                if remaining is not None:
+                    remaining += share - result.evaluations
+                threshold = min(threshold, result.fun)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    if values.min() < min((result.fun for result in results), default=np.inf):
+        j = int(np.argmin(values))
+        bracket = [float(grid[max(j - 1, 0)]), float(grid[min(j + 1, brackets)])]
+        return GlobalResult(float(grid[j]), float(values[j]), evaluations, bracket, results, pruned)
+    best = min(range(len(results)), key=lambda j: results[j].fun)
+    return GlobalResult(results[best].x, results[best].fun, evaluations, brackets_done[best], results, pruned)
+
+
+def _evaluate_point(function, x):
+    """
+    Значение функции в точке сетки (выполняется в процессе пула).
+    """
+    if isinstance(function, str):
+        from ExpressionEngine import compile_expression
+        function = compile_expression(function)
+    return float(function(x))
+
+
+def main():
+    func = "sin(3*x) + 0.1*(x - 1)**2"
+    result = global_minimize(func, [-10, 10], brackets=16, method="golden", epsilon=1e-6)
+    print("Отчёт по работе глобального поиска:")
+    print("-----------------------------------------")
+    print("Функция: " + func)
+    print("Точка минимума:", result.x)
+    print("Значение функции в точке минимума:", result.fun)
+    print("Подынтервал:", result.bracket)
+    print("Просмотрено подынтервалов:", len(result.results))
+    print("Отброшено подынтервалов:", result.pruned)
+    print("Количество вычислений функции:", result.evaluations)
+
+
+if __name__ == "__main__":
+    main()
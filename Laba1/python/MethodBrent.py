@@ -0,0 +1,156 @@
+import math
+import matplotlib.pyplot as plt
+import numpy as np
+
+from EvaluationCache import EvaluationCache
+from ExpressionEngine import compile_expression
+
+
+class BrentMethod:
+    def __init__(self, func, interval, epsilon=0.5, max_iterations=500, cache=None, hook=None):
+        """
+        Метод Брента: параболическая интерполяция с подстраховкой золотым сечением.
+
+        Пока парабола, проведённая через три лучшие точки, даёт шаг внутри интервала
+        и шаг уменьшается, используется её вершина; иначе делается шаг золотого сечения.
+
+        Args:
+            func: Функция f(x) или её строковое представление, например "3*x**2 - x + 4".
+            interval (list): Интервал для поиска минимума [a, b].
+            epsilon (float): Точность поиска (длина конечного интервала неопределённости).
+            max_iterations (int): Максимальное количество итераций.
+            cache (EvaluationCache): Кэш значений функции; если не задан, создаётся собственный.
+            hook: Объект для сбора метрик (например, Recorder из Service/Instrumentation.py)
+                с методами start, iteration и finish; если не задан, метрики не собираются.
+
+        Attributes:
+            interval (list): Текущий интервал неопределённости [a, b].
+            k (int): Количество выполненных итераций.
+            cache (EvaluationCache): Кэш значений функции со счётчиками вычислений.
+            trace: Объект с методом record(a, b) для записи интервалов по итерациям или None.
+        """
+        self.func = func
+        self.function = compile_expression(func) if isinstance(func, str) else func
+        self.interval = interval
+        self.epsilon = epsilon
+        self.max_iterations = max_iterations
+        self.cache = cache if cache is not None else EvaluationCache(self.function)
+        self.hook = hook
+        self.golden = (3 - math.sqrt(5)) / 2
+        self.rtol = math.sqrt(np.finfo(float).eps)
+        self.k = 0
+        self.trace = None
+
+    def parabolic_step(self, x, w, v, fx, fw, fv):
+        """
+        Вычисляет числитель и знаменатель шага к вершине параболы через точки x, w, v.
+        """
+        r = (x - w) * (fx - fv)
+        q = (x - v) * (fx - fw)
+        p = (x - v) * q - (x - w) * r
+        q = 2 * (q - r)
+        if q > 0:
+            p = -p
+        return p, abs(q)
+
+    def find_minimum(self):
+        """
+        Находит минимум функции на заданном интервале методом Брента.
+
+        Returns:
+            tuple: Точка минимума, значение функции в ней и количество итераций.
+        """
+        self.cache.reset_counters()
+        if self.hook is not None:
+            self.hook.start("brent")
+        a, b = self.interval
+        x = w = v = a + self.golden * (b - a)
+        fx = fw = fv = self.cache(x)
+        step = previous_step = 0.0
+        self.k = 0
+        while self.k < self.max_iterations:
+            middle = (a + b) / 2
+            tol1 = self.rtol * abs(x) + self.epsilon / 4
+            tol2 = 2 * tol1
+            if abs(x - middle) <= tol2 - (b - a) / 2:
+                break
+            use_golden = True
+            if abs(previous_step) > tol1:
+                p, q = self.parabolic_step(x, w, v, fx, fw, fv)
+                # Парабола принимается, если шаг попадает внутрь (a, b)
+                # и меньше половины позапрошлого шага
+                if abs(p) < abs(q * previous_step / 2) and q * (a - x) < p < q * (b - x):
+                    previous_step, step = step, p / q
+                    u = x + step
+                    if u - a < tol2 or b - u < tol2:
+                        step = tol1 if middle >= x else -tol1
+                    use_golden = False
+            if use_golden:
+                previous_step = (a - x) if x >= middle else (b - x)
+                step = self.golden * previous_step
+            u = x + (step if abs(step) >= tol1 else math.copysign(tol1, step))
+            fu = self.cache(u)
+            if fu <= fx:
+                if u >= x:
+                    a = x
+                else:
+                    b = x
+                v, w, x = w, x, u
+                fv, fw, fx = fw, fx, fu
+            else:
+                if u < x:
+                    a = u
+                else:
+                    b = u
+                if fu <= fw or w == x:
+                    v, w = w, u
+                    fv, fw = fw, fu
+                elif fu <= fv or v == x or v == w:
+                    v, fv = u, fu
+            self.k += 1
+            if self.trace is not None:
+                self.trace.record(a, b)
+            if self.hook is not None:
+                self.hook.iteration(self.k, evaluations=self.cache.evaluations)
+
+        self.interval = [a, b]
+        if self.hook is not None:
+            self.hook.finish(iterations=self.k, evaluations=self.cache.evaluations)
+        return x, fx, self.k
+
+    def print_results(self, minimum, value):
+        """
+        Выводит результаты поиска в консоль.
+        """
+        print("Отчёт по работе метода:")
+        print("---------------------------------------------")
+        print("Исходная функция:", self.func if isinstance(self.func, str) else "f(x)")
+        print("Точка минимума:", minimum)
+        print("Значение функции в точке минимума:", value)
+        print("Конечный интервал неопределенности:", self.interval)
+        print("Конечное k:", self.k)
+        print("Количество вычислений функции:", self.cache.evaluations)
+        print("Точность (по отношению к epsilon):", math.fabs(self.interval[1] - self.interval[0]))
+
+    def plot_graph(self, minimum, value):
+        """
+        Строит график функции и отмечает на нем точку минимума.
+        """
+        x_range = np.linspace(-10, 10, 1000)
+        plt.plot(x_range, [self.function(x) for x in x_range], label='f(x)', color='orange')
+        plt.scatter(minimum, value, color='red', s=20, label='Минимум')
+        plt.xlabel('X')
+        plt.ylabel('Y')
+        plt.legend()
+        plt.show()
+
+
+def main():
+    brent = BrentMethod("3*x**2 - x + 4", [-4, 6], epsilon=0.5)
+    minimum, value, _ = brent.find_minimum()
+    brent.print_results(minimum, value)
+    brent.plot_graph(minimum, value)
+
+
+if __name__ == "__main__":
+    main()
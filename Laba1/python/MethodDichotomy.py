@@ -2,12 +2,15 @@ import math
 import matplotlib.pyplot as plt
 import numpy as np
 
+from EvaluationCache import EvaluationCache
+
 class DichotomyMethod:
     """
     Класс, реализующий метод дихотомии для поиска минимума функции.
     """
 
-    def __init__(self, function: callable, interval: list, sigma: float, epsilon: float):
+    def __init__(self, function: callable, interval: list, sigma: float, epsilon: float,
+                 cache: EvaluationCache = None, executor=None, hook=None):
         """
         Конструктор класса.
 
@@ -15,27 +18,75 @@ class DichotomyMethod:
         :param interval: начальный интервал неопределенности.
         :param sigma: шаг поиска.
         :param epsilon: точность поиска.
+        :param cache: кэш значений функции; если не задан, создаётся собственный.
+        :param executor: пул потоков или процессов для одновременного вычисления функции
+            в точках y и z; если не задан, точки вычисляются последовательно.
+        :param hook: объект для сбора метрик (например, Recorder из Service/Instrumentation.py)
+            с методами start, iteration и finish; если не задан, метрики не собираются.
         """
         self.function = function
         self.interval = interval
         self.sigma = sigma
         self.epsilon = epsilon
+        self.cache = cache if cache is not None else EvaluationCache(_ScalarFunction(function))
+        self.executor = executor
+        self.hook = hook
         self.k = 0
         self.n = 0
+        self.fun = None
+        self.trace = None
 
     def find_minimum(self):
         """
         Метод, реализующий поиск минимума функции методом дихотомии.
+        Значение функции в точке минимума сохраняется в self.fun.
 
         :return: кортеж из точки минимума и количества итераций.
         """
+        self.cache.reset_counters()
+        if self.hook is not None:
+            self.hook.start("dichotomy")
         while not self.is_accurate():
             y, z = self.calculate_y_and_z()
-            self.n = self.calculate_n(y, z)
             self.update_interval(y, z)
+            self.n = self.calculate_n()
             self.k += 1
+            if self.trace is not None:
+                self.trace.record(self.interval[0], self.interval[1])
+            if self.hook is not None:
+                self.hook.iteration(self.k, evaluations=self.cache.evaluations)
+        minimum = self.calculate_minimum()
+        self.fun = self.cache(minimum)
+        if self.hook is not None:
+            self.hook.finish(iterations=self.k, evaluations=self.cache.evaluations)
+
+        return (minimum, self.n)
 
-        return (self.calculate_minimum(), self.n)
+    async def find_minimum_async(self):
+        """
+        Асинхронный вариант find_minimum: f(y) и f(z) вычисляются как задачи asyncio.
+
+        :return: кортеж из точки минимума и количества итераций.
+        """
+        self.cache.reset_counters()
+        if self.hook is not None:
+            self.hook.start("dichotomy")
+        while not self.is_accurate():
+            y, z = self.calculate_y_and_z()
+            fy, fz = await self.cache.evaluate_pair_async(y, z, self.executor)
+            self.shrink_interval(y, z, fy, fz)
+            self.n = self.calculate_n()
+            self.k += 1
+            if self.trace is not None:
+                self.trace.record(self.interval[0], self.interval[1])
+            if self.hook is not None:
+                self.hook.iteration(self.k, evaluations=self.cache.evaluations)
+        minimum = self.calculate_minimum()
+        self.fun = self.cache(minimum)
+        if self.hook is not None:
+            self.hook.finish(iterations=self.k, evaluations=self.cache.evaluations)
+
+        return (minimum, self.n)
 
     def calculate_y_and_z(self):
         """
@@ -47,18 +98,12 @@ class DichotomyMethod:
         z = (self.interval[0] + self.interval[1] + self.sigma) / 2
         return y, z
 
-    def calculate_n(self, y: float, z: float):
+    def calculate_n(self):
         """
         Метод, вычисляющий индекс конечного интервала неопределенности.
 
-        :param y: значение y.
-        :param z: значение z.
         :return: индекс конечного интервала неопределенности.
         """
-        if self.function([y])[0] <= self.function([z])[0]:
-            self.interval[1] = z
-        else:
-            self.interval[0] = y
         return 2 * (self.k + 1)
 
     def update_interval(self, y: float, z: float):
@@ -68,7 +113,19 @@ class DichotomyMethod:
         :param y: значение y.
         :param z: значение z.
         """
-        if self.function([y])[0] <= self.function([z])[0]:
+        fy, fz = self.cache.evaluate_pair(y, z, self.executor)
+        self.shrink_interval(y, z, fy, fz)
+
+    def shrink_interval(self, y: float, z: float, fy: float, fz: float):
+        """
+        Метод, сокращающий интервал по уже вычисленным значениям функции.
+
+        :param y: значение y.
+        :param z: значение z.
+        :param fy: значение функции в точке y.
+        :param fz: значение функции в точке z.
+        """
+        if fy <= fz:
             self.interval[1] = z
         else:
             self.interval[0] = y
@@ -101,12 +158,14 @@ class DichotomyMethod:
         print("Исходная функция: 3x^2 - x + 4")
         print("Точка минимума:", minimum)
         print("Конечный интервал неопределенности:", self.interval)
-        print("Значение функции в точке минимума:", self.function([minimum])[0])
+        print("Значение функции в точке минимума:", self.cache(minimum))
         print("Индекс конечного интервала неопределённости:", n)
         print("Сходимость:", 1 / (math.pow(2, n)))
         print("Начальное k: 0")
         print("Конечное k:", self.k)
         print("Точность (по отношению к epsilon):", math.fabs(self.interval[1] - self.interval[0]))
+        print("Количество вычислений функции:", self.cache.evaluations)
+        print("Обращений к кэшу значений:", self.cache.hits)
 
     def functionForGraph(self, x_range):
         res = []
@@ -122,12 +181,26 @@ class DichotomyMethod:
         """
         x_range = np.linspace(-10, 10, 1000)
         plt.plot(x_range, self.functionForGraph(x_range), label='f(x)', color='orange')
-        plt.scatter(minimum, self.function([minimum])[0], color='red', s=20, label='Минимум')
+        plt.scatter(minimum, self.cache(minimum), color='red', s=20, label='Минимум')
         plt.xlabel('X')
         plt.ylabel('Y')
         plt.legend()
         plt.show()
 
+class _ScalarFunction:
+    """
+    Приводит функцию вида f([x]) -> [value] к виду f(x) -> value.
+
+    Оформлена классом, а не лямбдой, чтобы её можно было передать в пул процессов.
+    """
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, x):
+        return self.function([x])[0]
+
+
 def main():
     """
     Главная функция, создающая экземпляр класса DichotomyMethod и вызывающая методы для поиска минимума, вывода результатов и построения графика.
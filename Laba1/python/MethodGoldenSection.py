@@ -2,28 +2,43 @@ import math
 import matplotlib.pyplot as plt
 import numpy as np
 
+from EvaluationCache import EvaluationCache
+from ExpressionEngine import compile_expression
+
 class GoldenSectionMethod:
-    def __init__(self, func, interval, epsilon):
+    def __init__(self, func, interval, epsilon, cache=None, max_evaluations=None, hook=None):
         """
         Инициализация метода золотого сечения.
 
         Args:
-            func: Функция, для которой ищется минимум.
+            func: Функция f(x) или её строковое представление, для которой ищется минимум.
             interval: Интервал, в котором происходит поиск минимума.
             epsilon: Точность поиска.
+            cache: Кэш значений функции (EvaluationCache); если не задан, создаётся собственный.
+            max_evaluations: Бюджет вычислений функции (включая значение в найденной точке);
+                поиск останавливается, когда он исчерпан или когда длина интервала стала меньше epsilon.
+            hook: Объект для сбора метрик (например, Recorder из Service/Instrumentation.py)
+                с методами start, iteration и finish; если не задан, метрики не собираются.
         """
+        if max_evaluations is not None and max_evaluations < 3:
+            raise ValueError("Бюджет вычислений функции должен быть не меньше 3")
         self.func = func
+        self._callable = compile_expression(func) if isinstance(func, str) else func
         self.interval = interval
         self.epsilon = epsilon
+        self.max_evaluations = max_evaluations
+        self.hook = hook
+        self.cache = cache if cache is not None else EvaluationCache(self._callable)
         self.num_1 = (3 - math.sqrt(5)) / 2
         self.num_2 = 1 - self.num_1
         self.k = 0
-        self.count_n_for = 0
         self.n = 0
+        self.fun = None
+        self.trace = None
 
     def function(self, x):
         """Вычисление значения функции в точке x."""
-        return 3 * x ** 2 - x + 4
+        return self._callable(x)
 
     def y_z(self):
         """Нахождение новых значений y и z."""
@@ -31,38 +46,58 @@ class GoldenSectionMethod:
         z = self.interval[0] + self.interval[1] - y
         return y, z
 
-    def fy_fz(self, y, z):
-        """Вычисление значений функции в точках y и z и обновление интервала."""
-        fy = self.function(y)
-        fz = self.function(z)
+    def fy_fz(self, y, z, fy, fz):
+        """
+        Обновление интервала по известным значениям функции в точках y и z.
+
+        Одна из точек остаётся внутри нового интервала вместе со своим значением,
+        поэтому на итерации вычисляется функция только в одной новой точке.
+        Новая точка откладывается от границы интервала, а не отражением старой:
+        при отражении ошибка округления растёт от итерации к итерации.
+        """
         if fy <= fz:
             self.interval[1] = z
-            y_new = self.interval[0] + self.interval[1] - y
-            z_new = y
+            z, fz = y, fy
+            y = self.interval[0] + self.num_1 * (self.interval[1] - self.interval[0])
+            fy = self.cache(y)
         else:
             self.interval[0] = y
-            y_new = z
-            z_new = self.interval[0] + self.interval[1] - z
-        if self.count_n_for == 0:
-            self.n = 2 * (self.k + 1)
-            self.count_n_for += 1
-        else:
-            self.n += 1
-            self.count_n_for += 1
-        return y_new, z_new
+            y, fy = z, fz
+            z = self.interval[0] + self.num_2 * (self.interval[1] - self.interval[0])
+            fz = self.cache(z)
+        self.n += 1
+        return y, z, fy, fz
 
     def accuracy(self):
         """Проверка достижения требуемой точности."""
         return math.fabs(self.interval[1] - self.interval[0]) < self.epsilon
 
+    def budget_exhausted(self):
+        """Проверка исчерпания бюджета вычислений функции (одно вычисление остаётся на точку минимума)."""
+        return self.max_evaluations is not None and self.n + 1 >= self.max_evaluations
+
     def optimize(self):
-        """Основной метод оптимизации."""
+        """Основной метод оптимизации; значение в точке минимума сохраняется в self.fun."""
+        self.cache.reset_counters()
+        if self.hook is not None:
+            self.hook.start("golden")
         y, z = self.y_z()
-        while not self.accuracy():
-            y, z = self.fy_fz(y, z)
+        fy, fz = self.cache(y), self.cache(z)
+        self.n = 2
+        while not self.accuracy() and not self.budget_exhausted():
+            y, z, fy, fz = self.fy_fz(y, z, fy, fz)
             self.k += 1
-            if(self.k == self.n-3):
-                break
+            if self.trace is not None:
+                self.trace.record(self.interval[0], self.interval[1])
+            if self.hook is not None:
+                self.hook.iteration(self.k, evaluations=self.cache.evaluations)
+        self.fun = self.cache(self.calculate_minimum())
+        if self.hook is not None:
+            self.hook.finish(iterations=self.k, evaluations=self.cache.evaluations)
+
+    def calculate_minimum(self):
+        """Точка минимума - середина конечного интервала."""
+        return (self.interval[1] + self.interval[0]) / 2
 
     def print_results(self):
         """Вывод результатов поиска минимума в консоль."""
@@ -70,30 +105,31 @@ class GoldenSectionMethod:
         print("\nОтчёт по работе метода:")
         print("\n-------------------------------------")
         print("\nНа вход принимает:")
-        print("Исходная функция: 3x^2 - x + 4")
+        print("Исходная функция:", self.func if isinstance(self.func, str) else "f(x)")
         print("Интервал неопределенности:", self.interval)
         print("Точность epsilon:", self.epsilon)
-        print("Сама функция: 3x^2 - x + 4")
         print("Начальное k:", self.k)
         print("\n-------------------------------------")
 
         self.optimize()
 
         print("\nПолучаем:")
-        print("Точка min:", (self.interval[1] - self.interval[0]) / 2)
-        print("Значение функции в точке min:", self.function((self.interval[1] - self.interval[0]) / 2))
+        print("Точка min:", self.calculate_minimum())
+        print("Значение функции в точке min:", self.cache(self.calculate_minimum()))
         print("Интервал, в котором находится точка min(конечный интервал):", self.interval)
         print("Индекс конечного интервала n:", self.n)
         print("Сходимость:", math.pow(self.num_2, self.n - 1))
         print("Конечное k:", self.k)
         print("Точность (по отношению к epsilon):", math.fabs(self.interval[1] - self.interval[0]))
+        print("Количество вычислений функции:", self.cache.evaluations)
+        print("Обращений к кэшу значений:", self.cache.hits)
         print("\n-------------------------------------")
 
     def plot_graph(self):
         """Построение графика функции с отмеченным минимумом."""
         x_range = np.linspace(-10, 10, 1000)
         plt.plot(x_range, [self.function(x) for x in x_range], label='f(x)', color="orange")
-        plt.scatter((self.interval[1] + self.interval[0]) / 2, self.function((self.interval[1] + self.interval[0]) / 2),
+        plt.scatter(self.calculate_minimum(), self.cache(self.calculate_minimum()),
                     color='red', s=20, label='Минимум')
         plt.xlabel('X')
         plt.ylabel('Y')
@@ -0,0 +1,159 @@
+import math
+
+import numpy as np
+
+from FibonacciMethod import FibonacciMethod
+from MethodBrent import BrentMethod
+from MethodDichotomy import DichotomyMethod
+from MethodGoldenSection import GoldenSectionMethod
+
+METHODS = ("dichotomy", "golden", "fibonacci", "brent")
+
+
+class ScalarTrace:
+    """
+    История интервалов неопределённости по итерациям.
+
+    Значения хранятся в заранее выделенных массивах numpy; при нехватке места
+    ёмкость удваивается. Массивы lower и upper - представления без копирования.
+    """
+
+    __slots__ = ("_lower", "_upper", "size")
+
+    def __init__(self, capacity=64):
+        capacity = max(int(capacity), 1)
+        self._lower = np.empty(capacity)
+        self._upper = np.empty(capacity)
+        self.size = 0
+
+    def record(self, a, b):
+        """Добавляет интервал [a, b] очередной итерации."""
+        if self.size == self._lower.shape[0]:
+            self._lower = np.resize(self._lower, 2 * self.size)
+            self._upper = np.resize(self._upper, 2 * self.size)
+        self._lower[self.size] = a
+        self._upper[self.size] = b
+        self.size += 1
+
+    @property
+    def lower(self):
+        """Левые границы интервалов."""
+        return self._lower[:self.size]
+
+    @property
+    def upper(self):
+        """Правые границы интервалов."""
+        return self._upper[:self.size]
+
+    @property
+    def width(self):
+        """Длины интервалов."""
+        return self.upper - self.lower
+
+    def __len__(self):
+        return self.size
+
+
+class ScalarResult:
+    """
+    Результат одномерной минимизации.
+
+    Attributes:
+        x (float): Точка минимума.
+        fun (float): Значение функции в точке минимума.
+        evaluations (int): Количество вычислений функции.
+        iterations (int): Количество итераций.
+        interval (list): Конечный интервал неопределённости.
+        method (str): Название метода.
+        trace (ScalarTrace): История интервалов или None.
+    """
+
+    __slots__ = ("x", "fun", "evaluations", "iterations", "interval", "method", "trace")
+
+    def __init__(self, x, fun, evaluations, iterations, interval, method, trace=None):
+        self.x = x
+        self.fun = fun
+        self.evaluations = evaluations
+        self.iterations = iterations
+        self.interval = interval
+        self.method = method
+        self.trace = trace
+
+    def __repr__(self):
+        return (f"ScalarResult(method={self.method!r}, x={self.x!r}, fun={self.fun!r}, "
+                f"evaluations={self.evaluations}, iterations={self.iterations})")
+
+
+def _estimate_iterations(method, interval, epsilon):
+    """
+    Оценивает количество итераций, чтобы сразу выделить память под историю.
+    """
+    ratio = max(abs(interval[1] - interval[0]) / epsilon, 1.0)
+    if method == "golden":
+        return math.ceil(math.log(ratio) / math.log((1 + math.sqrt(5)) / 2)) + 2
+    return math.ceil(math.log2(ratio)) + 2
+
+
+def minimize_scalar(function, interval, method="golden", epsilon=1e-5, trace=False, **options):
+    """
+    Единый интерфейс к одномерным методам минимизации.
+
+    Args:
+        function: Функция f(x) -> float или её строковое представление.
+        interval (list): Интервал для поиска минимума [a, b].
+        method (str): Один из METHODS: "dichotomy", "golden", "fibonacci", "brent".
+        epsilon (float): Требуемая длина конечного интервала неопределённости.
+        trace (bool): Сохранять ли историю интервалов по итерациям.
+        **options: Дополнительные параметры метода (sigma для дихотомии, n и delta
+            для Фибоначчи, max_evaluations для золотого сечения, max_iterations для Брента,
+            cache для всех методов).
+
+    Returns:
+        ScalarResult: Точка минимума, значение, количество вычислений и итераций.
+    """
+    interval = [float(interval[0]), float(interval[1])]
+    if method == "dichotomy":
+        if isinstance(function, str):
+            from ExpressionEngine import compile_expression
+            function = compile_expression(function)
+        sigma = options.pop("sigma", epsilon / 4)
+        solver = DichotomyMethod(_ListFunction(function), interval, sigma, epsilon, **options)
+    elif method == "golden":
+        solver = GoldenSectionMethod(function, interval, epsilon, **options)
+    elif method == "fibonacci":
+        solver = FibonacciMethod(function, interval, epsilon, **options)
+    elif method == "brent":
+        solver = BrentMethod(function, interval, epsilon, **options)
+    else:
+        raise ValueError(f"Неизвестный метод '{method}', доступны: {', '.join(METHODS)}")
+
+    if trace:
+        capacity = solver.n if method == "fibonacci" else _estimate_iterations(method, interval, epsilon)
+        solver.trace = ScalarTrace(capacity)
+
+    if method == "dichotomy":
+        x, _ = solver.find_minimum()
+        fun, iterations = solver.fun, solver.k
+    elif method == "golden":
+        solver.optimize()
+        x = solver.calculate_minimum()
+        fun, iterations = solver.fun, solver.k
+    else:
+        x, fun, iterations = solver.find_minimum()
+
+    return ScalarResult(x, fun, solver.cache.evaluations, iterations, list(solver.interval),
+                        method, solver.trace)
+
+
+class _ListFunction:
+    """
+    Приводит f(x) к соглашению DichotomyMethod: f([x]) -> [value].
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, x):
+        return [self.function(x[0])]
@@ -0,0 +1,156 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Символьное дифференцирование (sympy) строится за время, растущее быстрее n: около 3 с для
+# 100 переменных, 15-20 с для 400 и несколько минут для 3000. Поэтому для n_vars > SYMBOLIC_LIMIT
+# производные считаются комплексным шагом: f вызывается от блоков точек x + i*h*e_j, и
+# градиент получается с машинной точностью без построения формул.
+SYMBOLIC_LIMIT = 100
+
+# Сколько комплексных чисел содержит один блок точек комплексного шага (ограничивает память)
+_CHUNK_SIZE = 2 ** 22
+
+# Сколько построенных функций хранится (кэш ключуется объектом f, а в долгоживущих процессах
+# BatchRunner и JobServer новых f может быть сколько угодно)
+_CACHE_SIZE = 64
+
+
+def _symbols(n_vars: int):
+    """
+    Функция, которая создаёт символьные переменные x0, ..., x{n-1}
+    Args: n_vars - количество переменных
+    Return: кортеж символов sympy
+    """
+    import sympy as sp
+    return sp.symbols(f"x0:{n_vars}", real=True)
+
+
+def _derivatives(expression, x):
+    """
+    Функция, которая дифференцирует выражение по всем переменным
+    Args: expression - выражение sympy; x - символьные переменные
+    Return: список частных производных
+
+    Сумма дифференцируется по слагаемым и только по тем переменным, которые в них
+    входят: для функций многих переменных это намного быстрее, чем sp.diff по каждой
+    переменной от всего выражения.
+    """
+    import sympy as sp
+    index = {xi: i for i, xi in enumerate(x)}
+    parts = [[] for _ in x]
+    for term in sp.Add.make_args(expression):
+        for symbol in term.free_symbols:
+            if symbol in index:
+                parts[index[symbol]].append(sp.diff(term, symbol))
+    return [sp.Add(*part) for part in parts]
+
+
+def _compile(expressions, x):
+    """
+    Функция, которая компилирует список выражений sympy в функцию numpy
+    Args: expressions - список выражений; x - символьные переменные
+    Return: функция от вектора (или массива точек формы (n, ...)), возвращающая массив значений
+    """
+    import sympy as sp
+    compiled = sp.lambdify([x], expressions, modules="numpy", cse=True)
+    if all(expression.free_symbols for expression in expressions):
+        return lambda point: np.array(compiled(point))
+    # Постоянные компоненты нужно растянуть до формы массива точек
+    return lambda point: np.array([np.broadcast_to(value, np.shape(point)[1:]) for value in compiled(point)],
+                                  dtype=float)
+
+
+def _complex_step(f, n_vars: int, point) -> tuple:
+    """
+    Функция, которая вычисляет значение и градиент f комплексным шагом
+    Args: f - функция от вектора (те же операции, что для символьного пути, должны работать с
+          комплексными числами); n_vars - количество переменных; point - точка (n,) или массив (n, ...)
+    Return: кортеж (f(point), градиент формы point.shape)
+
+    Im f(x + i h e_j) / h = df/dx_j + O(h^2) без вычитания близких чисел, поэтому h = 1e-20.
+    Координаты обрабатываются блоками по _CHUNK_SIZE комплексных чисел, f - один вызов на блок.
+    """
+    h = 1e-20
+    point = np.asarray(point, dtype=float)
+    rest = point.shape[1:]
+    block = max(1, _CHUNK_SIZE // (n_vars * int(np.prod(rest, dtype=int))))
+    grad = np.empty(point.shape)
+    value = None
+    for start in range(0, n_vars, block):
+        stop = min(start + block, n_vars)
+        shifts = np.zeros((n_vars, stop - start) + (1,) * len(rest))
+        shifts[np.arange(start, stop), np.arange(stop - start)] = h
+        values = np.asarray(f(point[:, np.newaxis] + 1j * shifts))
+        grad[start:stop] = values.imag / h
+        if value is None:
+            # Действительная часть совпадает с f(point) с точностью O(h^2)
+            value = values[0].real
+    return value, grad
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def gradient(f, n_vars: int):
+    """
+    Функция, которая строит градиент функции f символьным дифференцированием
+    Args: f - функция от вектора, записанная через x[0], x[1], ... и арифметические операции
+          (функции numpy к символам sympy неприменимы); n_vars - количество переменных
+    Return: функция grad(x) -> ndarray, скомпилированная в numpy (строится один раз для каждой f);
+            при n_vars > SYMBOLIC_LIMIT - градиент комплексным шагом (f должна считать массивы точек)
+    """
+    if n_vars > SYMBOLIC_LIMIT:
+        return lambda point: _complex_step(f, n_vars, point)[1]
+    import sympy as sp
+    x = _symbols(n_vars)
+    expression = sp.sympify(f(x))
+    return _compile(_derivatives(expression, x), x)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def hessian(f, n_vars: int):
+    """
+    Функция, которая строит матрицу Гессе функции f символьным дифференцированием
+    Args: f - функция от вектора; n_vars - количество переменных
+    Return: функция hess(x) -> ndarray формы (n, n) (строится один раз для каждой f); при
+            n_vars > SYMBOLIC_LIMIT - центральные разности градиента, посчитанного комплексным шагом
+            (только для одной точки формы (n,))
+    """
+    if n_vars > SYMBOLIC_LIMIT:
+        def finite_hessian(point):
+            point = np.asarray(point, dtype=float)
+            steps = np.finfo(float).eps ** (1 / 3) * np.maximum(1.0, np.abs(point))
+            steps = (point + steps) - point
+            shifts = np.diag(steps)
+            # Столбцы - точки x + h_j e_j и x - h_j e_j; градиент во всех 2n точках считается блоками
+            points = np.concatenate((point[:, np.newaxis] + shifts, point[:, np.newaxis] - shifts), axis=1)
+            grads = _complex_step(f, n_vars, points)[1]
+            h = (grads[:, :n_vars] - grads[:, n_vars:]) / (2 * steps)
+            return (h + h.T) / 2
+        return finite_hessian
+    import sympy as sp
+    x = _symbols(n_vars)
+    expression = sp.sympify(f(x))
+    second = [d2 for d1 in _derivatives(expression, x) for d2 in _derivatives(d1, x)]
+    compiled = _compile(second, x)
+    return lambda point: compiled(point).reshape((n_vars, n_vars) + np.shape(point)[1:])
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def value_and_gradient(f, n_vars: int):
+    """
+    Функция, которая строит совместное вычисление значения и градиента f
+    Args: f - функция от вектора; n_vars - количество переменных
+    Return: функция x -> (f(x), grad(x)); общие подвыражения f и производных вычисляются один раз
+            (при n_vars > SYMBOLIC_LIMIT значение и градиент берутся из одних вызовов комплексного шага)
+    """
+    if n_vars > SYMBOLIC_LIMIT:
+        return lambda point: _complex_step(f, n_vars, point)
+    import sympy as sp
+    x = _symbols(n_vars)
+    expression = sp.sympify(f(x))
+    compiled = _compile([expression] + _derivatives(expression, x), x)
+
+    def evaluate(point):
+        values = compiled(point)
+        return values[0], values[1:]
+    return evaluate
@@ -0,0 +1,205 @@
+from typing import NamedTuple
+
+import numpy as np
+
+
+class QuadraticProblem:
+    """
+    Квадратичная задача f(x) = 1/2 (x, A x) - (b, x) с симметричной положительно определённой A.
+
+    A можно задать плотной матрицей, разреженной матрицей scipy.sparse или функцией
+    v -> A v (тогда матрица нигде не хранится). Для предобуславливателя Якоби у функции
+    нужно отдельно передать diagonal - диагональ A.
+    Для функции лабораторной x0² + 8x1² + x0x1 + x0: A = [[2, 1], [1, 16]], b = [-1, 0].
+    """
+
+    def __init__(self, A, b, diagonal=None):
+        self.A = A
+        self.b = np.asarray(b, dtype=float)
+        self._diagonal = diagonal
+        if callable(A):
+            self.matvec = A
+        elif hasattr(A, "tocsr"):
+            self.matvec = A.dot
+        else:
+            self.A = np.asarray(A, dtype=float)
+            self.matvec = self.A.dot
+
+    @property
+    def n(self) -> int:
+        return self.b.shape[0]
+
+    def value(self, x: np.ndarray) -> float:
+        """
+        Функция, которая считает значение f в точке x
+        Args: x - вектор
+        Return: 1/2 (x, A x) - (b, x)
+        """
+        return float(np.dot(x, 0.5 * self.matvec(x) - self.b))
+
+    def gradient(self, x: np.ndarray) -> np.ndarray:
+        """
+        Функция, которая считает градиент f в точке x
+        Args: x - вектор
+        Return: A x - b
+        """
+        return self.matvec(x) - self.b
+
+    def diagonal(self) -> np.ndarray:
+        """
+        Функция, которая возвращает диагональ A
+        Return: вектор диагонали (для A-функции - переданный в конструктор diagonal)
+        """
+        if self._diagonal is not None:
+            return np.asarray(self._diagonal, dtype=float)
+        if callable(self.A):
+            raise ValueError("Для A, заданной функцией, нужно передать diagonal")
+        return np.asarray(self.A.diagonal(), dtype=float)
+
+
+class CGResult(NamedTuple):
+    """
+    Результат метода сопряжённых градиентов.
+
+    x - точка минимума; fun - значение f в ней; k - количество итераций;
+    residual - норма градиента в x; matvecs - количество умножений на A.
+    """
+    x: np.ndarray
+    fun: float
+    k: int
+    residual: float
+    matvecs: int
+
+
+def jacobi(problem: QuadraticProblem):
+    """
+    Функция, которая строит предобуславливатель Якоби
+    Args: problem - квадратичная задача
+    Return: функция r -> D^(-1) r
+    """
+    inverse_diagonal = 1.0 / problem.diagonal()
+    return lambda r: inverse_diagonal * r
+
+
+def incomplete_cholesky(problem: QuadraticProblem, drop_tol: float = 1e-2, fill_factor: float = 10):
+    """
+    Функция, которая строит неполное разложение A ~ L D L^T как предобуславливатель
+    Args: problem - задача с A в виде матрицы; drop_tol и fill_factor - параметры прореживания
+    Return: функция r -> (L D L^T)^(-1) r
+
+    В scipy нет неполного Холецкого, поэтому берётся неполное LU без перестановок
+    и выбора ведущего элемента: из него используются только L и диагональ U, так что
+    предобуславливатель симметричен, как того требует метод сопряжённых градиентов.
+    """
+    if callable(problem.A):
+        raise ValueError("Неполное разложение строится только для A, заданной матрицей")
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.linalg import spilu, spsolve_triangular
+    factor = spilu(csc_matrix(problem.A), drop_tol=drop_tol, fill_factor=fill_factor,
+                   permc_spec="NATURAL", diag_pivot_thresh=0.0)
+    lower = factor.L.tocsr()
+    upper = lower.T.tocsr()
+    diagonal = factor.U.diagonal()
+    if np.any(diagonal <= 0):
+        raise ValueError("Неполное разложение не положительно определено")
+
+    def solve(r):
+        y = spsolve_triangular(lower, r, lower=True, unit_diagonal=True)
+        y /= diagonal
+        return spsolve_triangular(upper, y, lower=False, unit_diagonal=True)
+    return solve
+
+
+PRECONDITIONERS = {
+    "jacobi": jacobi,
+    "ichol": incomplete_cholesky,
+}
+
+
+def conjugate_gradient(problem: QuadraticProblem, x_0=None, epsilon: float = 1e-8, max_iter: int = None,
+                       beta: str = "PR", restart: int = None, preconditioner=None) -> CGResult:
+    """
+    Функция, которая минимизирует квадратичную функцию методом сопряжённых градиентов
+    Args: problem - квадратичная задача; x_0 - начальная точка (по умолчанию нулевая);
+          epsilon - точность по норме градиента; max_iter - максимум итераций (по умолчанию n);
+          beta - формула "PR" (Полака-Рибьера) или "FR" (Флетчера-Ривса);
+          restart - через сколько итераций направление сбрасывается на (предобусловленный)
+          антиградиент (по умолчанию n); preconditioner - None, "jacobi", "ichol" или функция r -> M^(-1) r
+    Return: CGResult
+
+    Шаг t = (r, z) / (d, A d) считается по формуле, а невязка r = b - A x пересчитывается
+    рекуррентно, так что на итерацию приходится одно умножение на A.
+    """
+    if beta not in ("PR", "FR"):
+        raise ValueError("beta может быть 'PR' или 'FR'")
+    n = problem.n
+    max_iter = n if max_iter is None else max_iter
+    restart = n if restart is None else restart
+    if preconditioner is None:
+        precondition = None
+    elif callable(preconditioner):
+        precondition = preconditioner
+    elif preconditioner in PRECONDITIONERS:
+        precondition = PRECONDITIONERS[preconditioner](problem)
+    else:
+        raise ValueError(f"Неизвестный предобуславливатель: {preconditioner}")
+
+    x = np.zeros(n) if x_0 is None else np.array(x_0, dtype=float)
+    r = problem.b - problem.matvec(x)
+    matvecs = 1
+    z = r if precondition is None else precondition(r)
+    d = z.copy()
+    rz = float(np.dot(r, z))
+    r_old = np.empty_like(r)
+    residual = float(np.linalg.norm(r))
+    k = 0
+    while residual >= epsilon and k < max_iter:
+        ad = problem.matvec(d)
+        matvecs += 1
+        t = rz / float(np.dot(d, ad))
+        x += t * d
+        r_old[...] = r
+        r -= t * ad
+        residual = float(np.linalg.norm(r))
+        k += 1
+        if residual < epsilon:
+            break
+        z = r if precondition is None else precondition(r)
+        rz_new = float(np.dot(r, z))
+        if k % restart == 0:
+            betta = 0.0
+        elif beta == "FR":
+            betta = rz_new / rz
+        else:
+            betta = max(0.0, (rz_new - float(np.dot(z, r_old))) / rz)
+        d *= betta
+        d += z
+        rz = rz_new
+    return CGResult(x, problem.value(x), k, residual, matvecs)
+
+
+def main():
+    # Функция из лабораторной: x0² + 8x1² + x0x1 + x0
+    problem = QuadraticProblem(np.array([[2.0, 1.0], [1.0, 16.0]]), np.array([-1.0, 0.0]))
+    result = conjugate_gradient(problem, np.array([1.5, 0.5]), epsilon=0.1, beta="FR")
+    print(f"Координаты точки минимума: {result.x};\n f(x): {result.fun};\n k: {result.k}")
+
+    # Трёхдиагональная задача с миллионом неизвестных: A задана только функцией A v
+    n = 1_000_000
+    diagonal = 2.0 + np.linspace(0.0, 100.0, n)
+
+    def matvec(v):
+        av = diagonal * v
+        av[1:] -= v[:-1]
+        av[:-1] -= v[1:]
+        return av
+
+    problem = QuadraticProblem(matvec, np.ones(n), diagonal=diagonal)
+    for preconditioner in (None, "jacobi"):
+        result = conjugate_gradient(problem, epsilon=1e-8, preconditioner=preconditioner)
+        print(f"n = {n}, предобуславливатель: {preconditioner}: k = {result.k}, "
+              f"|grad| = {result.residual:.2e}, умножений на A: {result.matvecs}")
+
+
+if __name__ == "__main__":
+    main()
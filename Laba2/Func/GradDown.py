@@ -1,150 +1,206 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
-def create_x_range() -> list[list[float]]:
-    """
-    Функция, которая создаёт диапазон для функции
-    Args: отсутствует
-    Return: список списков с точками
-    """
-    x_range = []
-    step = 10 / 500
-    for i in range(1000):
-        x_range.append([-5 + (step * i), -5 + (step * i)])
-    return x_range
+from AutoGrad import gradient
+from Grid import evaluate_grid
+from LineSearch import safeguarded_step
+from Oracle import Oracle
+from Trace import Iterate, RingHistory, run, snapshot
 
-def f(x_list: list[list[float]]) -> list[float]:
+def f(x: np.ndarray) -> np.ndarray:
     """
     Функция двух переменных
-    Args: x - список значений x
-    Return: список значений функции
+    Args: x - вектор формы (2,) или массив точек формы (2, ...) (по первой оси - координаты)
+    Return: значение функции (число или массив формы (...))
     """
-    result = []
-    for x in x_list:
-        result.append([x[0]**2 + 8*(x[1]**2) + x[0]*x[1] + x[0]])
-    return result
+    return x[0]**2 + 8*(x[1]**2) + x[0]*x[1] + x[0]
 
-def grad_f(x: list[float]) -> list[float]:
+def grad_f(x: np.ndarray) -> np.ndarray:
     """
-    Функция, которая считает градиент функции f
-    Args: x - аргумент функции
-    Return: список значений
+    Функция, которая вычисляет градиент f
+    Args: x - вектор формы (2,) или массив точек формы (2, ...)
+    Return: градиент (строится по формуле f автоматически при первом вызове и компилируется один раз)
     """
-    return [2*x[0] + x[1] + 1, 16*x[1] + x[0]]
+    return gradient(f, 2)(x)
 
-def norm_grad(grad: list[float]) -> float:
+def norm_grad(grad: np.ndarray) -> float:
     """
     Функция, которая считает норму градиента
     Args: grad - градиент функции
     Return: значение нормы градиента функции
     """
-    return np.sqrt(grad[0]**2 + grad[1]**2)
+    return float(np.linalg.norm(grad))
 
-def calculate_t(x: list[float]) -> float:
+def calculate_t(x: np.ndarray, grad: np.ndarray, f_x: float, value, gradient, hess: np.ndarray) -> float:
     """
     Функция, которая вычисляет значение t на какой-то итерации
-    Args: x - аргумент
-    Return: значение t
+    Args: x - аргумент; grad и f_x - градиент и значение f в точке x; value и gradient - функции для
+          вычисления f и градиента в пробных точках (например, оракул); hess - матрица Гессе в точке x
+          или None (тогда кривизна берётся из разности градиентов)
+    Return: значение t (точный шаг вдоль антиградиента; если он не определён или не уменьшает f
+            достаточно - шаг дроблением по условию Армихо)
     """
-    return (2*x[0]*(2*x[0]+x[1]+1) + 16*x[1]*(16*x[1]+x[0]) + x[1]*(2*x[0]+x[1]+1) + x[0]*(16*x[1]+x[0]) + 2*x[0]+x[1]+1) / (2*((2*x[0]+x[1]+1)**2) + 16*((16*x[1]+x[0])**2) + 2*(2*x[0]+x[1]+1)*(16*x[1]+x[0]))
+    return safeguarded_step(value, gradient, x, -grad, grad, f_x, hess=hess, fallback="armijo").t
 
-def calculate_new_x(x_old: list[float], t: float) -> list[float]:
+def calculate_new_x(x_old: np.ndarray, t: float, grad: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     """
     Функция, которая вычисляет новое значение х
-    Args: x - значение старого x; t - значение t
+    Args: x - значение старого x; t - значение t; grad - градиент в точке x_old;
+          out - массив, в который записывается результат (если не задан, создаётся новый)
     Return: новое значение x
     """
-    return [x_old[0] - t * grad_f(x_old)[0], x_old[1] - t * grad_f(x_old)[1]]
+    out = np.multiply(grad, -t, out=out)
+    out += x_old
+    return out
 
-def norm_between_x(x_old: list[float], x_new: list[float]) -> float:
+def norm_between_x(x_old: np.ndarray, x_new: np.ndarray) -> float:
     """
     Функция, которая вычисляет норму между новым и старым х
     Args: x_old и x_new - старый и новый х
     Return: значение нормы
     """
-    return np.sqrt((x_new[0] - x_old[0])**2 + (x_new[1] - x_old[1])**2)
+    return float(np.linalg.norm(np.subtract(x_new, x_old)))
 
-def mod_between_f(x_old: list[float], x_new: list[float]) -> float:
+def mod_between_f(f_old: float, f_new: float) -> float:
     """
     Функция, которая вычисляет модуль между разницей новой и старой f
-    Args: x_old и x_new - старый и новый х
+    Args: f_old и f_new - значения f в старом и новом х (уже вычисленные оракулом)
     Return: значение модуля
     """
-    return abs(f([x_new])[0][0] - f([x_old])[0][0])
+    return abs(f_new - f_old)
 
 
-# Создать списки для сохранения значений x и f(x)
-x_history = []
-f_history = []
-
-x_0 = [1.5, 0.5]
-epsilon_1 = 0.1
-epsilon_2 = 0.15
-m = 10
-k = 0
-flag = 0
+def gradient_descent(x_0: np.ndarray, epsilon_1: float, epsilon_2: float, m: int, oracle: Oracle = None,
+                     hook=None):
+    """
+    Генератор, который выполняет наискорейший градиентный спуск, выдавая состояние на каждой итерации
+    Args: x_0 - начальная точка; epsilon_1, epsilon_2 - точности; m - максимальное количество итераций;
+          oracle - оракул f (по умолчанию строится по формуле f; в нём же считаются вычисления);
+          hook - объект для сбора метрик (Recorder из Service/Instrumentation.py) или None
+    Return: выдаёт Iterate(k, x, f) в начале каждой итерации; возвращает (x_min, f_min, k)
+    """
+    oracle = Oracle.from_expression(f, 2) if oracle is None else oracle
+    if hook is not None:
+        hook.start("gradient_descent")
+    x_0 = np.array(x_0, dtype=float)
+    x_new = np.empty_like(x_0)
+    k = 0
+    flag = 0
 
-while k < m:
+    while k < m:
 
-    # Добавить текущее значение x и f(x) в историю
-    x_history.append(x_0)
-    f_history.append(f([x_0])[0][0])
+        #шаг 3: значение и градиент в x_0 (в точке x_new они уже вычислены на прошлой итерации)
+        f_x_0, grad_f_x_0 = oracle.value_and_grad(x_0)
+        if hook is not None:
+            hook.iteration(k, f=f_x_0, nf=oracle.nf, ng=oracle.ng, nh=oracle.nh)
+        # Выдать текущее состояние (история хранится у вызывающего кода)
+        yield Iterate(k, snapshot(x_0), f_x_0)
 
-    #шаг 3
-    grad_f_x_0 = grad_f(x_0)
-    #шаг 4
-    norm_grad_f_x_0 = norm_grad(grad_f_x_0)
-    if norm_grad_f_x_0 < epsilon_1:
-        x_min = x_0
-        f_min = f([x_min])
-        break
-    else:
-        #шаг 5
-        if k >= m:
+        #шаг 4
+        norm_grad_f_x_0 = norm_grad(grad_f_x_0)
+        if norm_grad_f_x_0 < epsilon_1:
             x_min = x_0
-            f_min = f([x_min])
+            f_min = f_x_0
             break
         else:
-            #шаг 6
-            t = calculate_t(x_0)
-            #шаг 7
-            x_new = calculate_new_x(x_0, t)
-            #шаг 8
-            between_x = norm_between_x(x_0, x_new)
-            between_f = mod_between_f(x_0, x_new)
-            if between_x < epsilon_2 and between_f < epsilon_2:
-                if flag == 1:
-                    flag = 2
-                    x_min = x_0
-                    f_min = f([x_min])
-                    break
+            #шаг 5
+            if k >= m:
+                x_min = x_0
+                f_min = f_x_0
+                break
+            else:
+                #шаг 6
+                # Матрица Гессе запрашивается, только если она есть у оракула; иначе H d для точного
+                # шага берётся из разности градиентов оракула
+                hess_x_0 = None
+                if oracle.hess is not None:
+                    if hook is not None:
+                        hook.begin("hessian")
+                    hess_x_0 = oracle.hessian(x_0)
+                    if hook is not None:
+                        hook.end("hessian")
+                if hook is not None:
+                    hook.begin("line_search")
+                t = calculate_t(x_0, grad_f_x_0, f_x_0, oracle.value, oracle.grad, hess_x_0)
+                if hook is not None:
+                    hook.end("line_search")
+                #шаг 7
+                x_new = calculate_new_x(x_0, t, grad_f_x_0, out=x_new)
+                #шаг 8
+                between_x = norm_between_x(x_0, x_new)
+                f_x_new = oracle.value_and_grad(x_new)[0]
+                between_f = mod_between_f(f_x_0, f_x_new)
+                if between_x < epsilon_2 and between_f < epsilon_2:
+                    if flag == 1:
+                        flag = 2
+                        x_min = x_0
+                        f_min = f_x_0
+                        break
+                    else:
+                        flag = 1
+                        x_0, x_new = x_new, x_0
+                        k += 1
                 else:
-                    flag = 1
-                    x_0 = x_new
+                    x_0, x_new = x_new, x_0
                     k += 1
-            else:
-                x_0 = x_new
-                k += 1
+    else:
+        # Достигнуто ограничение m: минимумом считается последняя точка
+        x_min = x_0
+        f_min = oracle.value(x_min)
+    if hook is not None:
+        hook.finish(iterations=k, nf=oracle.nf, ng=oracle.ng, nh=oracle.nh)
+    return x_min.copy(), f_min, k
+
+
+def minimize(x_0: np.ndarray, epsilon_1: float = 0.1, epsilon_2: float = 0.15, m: int = 10,
+             consumers: tuple = (), oracle: Oracle = None, hook=None) -> tuple:
+    """
+    Функция, которая ищет минимум f, начиная с x_0
+    Args: x_0 - начальная точка; epsilon_1, epsilon_2 - точности; m - максимальное количество итераций;
+          consumers - функции, которые получают состояние Iterate на каждой итерации;
+          oracle - оракул f (его счётчики nf, ng, nh показывают число вычислений за запуск);
+          hook - объект для сбора метрик по итерациям и участкам (line_search, direction, hessian)
+    Return: кортеж (x_min, f_min, k)
+    """
+    return run(gradient_descent(x_0, epsilon_1, epsilon_2, m, oracle, hook), *consumers)
+
+
+def plot(x_min: np.ndarray, f_min: float, history: RingHistory):
+    """
+    Функция, которая рисует поверхность f, точку минимума и шаги метода
+    Args: x_min, f_min - найденный минимум; history - история итераций
+    Return: отсутствует
+    """
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+
+    x, y, z = evaluate_grid(f, ((-5, 5), (-5, 5)), 500)
+
+    fig = plt.figure()
+    ax = fig.add_subplot(1, 1, 1, projection="3d")
+    ax.plot_surface(x, y, z, cmap='viridis', alpha=0.6)
+    ax.scatter(x_min[0], x_min[1], f_min, color="red")
+
+    # Добавить отображение шагов минимизации
+    ax.plot(history.x[:, 0], history.x[:, 1], history.f, marker='o', color='blue')
+
+    plt.show()
 
-print(f"Координаты точки минимума: {x_min};\n f(x): {f_min};\n k: {k}")
 
-# Изменить часть для построения графика
-x_range = create_x_range()
-x1_values = np.array([x_range[i][0] for i in range(len(x_range))])
-x2_values = x1_values.copy()
+def main():
+    x_0 = np.array([1.5, 0.5])
+    epsilon_1 = 0.1
+    epsilon_2 = 0.15
+    m = 10
 
-x, y = np.meshgrid(x1_values, x2_values)
-z = np.array(f(x_range))
+    # История ограничена m + 1 последними итерациями и заполняется по ходу работы метода
+    history = RingHistory(m + 1, x_0.shape[0])
+    oracle = Oracle.from_expression(f, 2)
+    x_min, f_min, k = minimize(x_0, epsilon_1, epsilon_2, m, consumers=(history,), oracle=oracle)
 
-fig = plt.figure()
-ax = fig.add_subplot(1, 1, 1, projection="3d")
-ax.plot_surface(x, y, z, cmap='viridis', alpha=0.6)
-ax.scatter(x_min[0], x_min[1], f_min, color="red")
+    print(f"Координаты точки минимума: {x_min};\n f(x): {f_min};\n k: {k}")
+    print(f"Количество вычислений: f - {oracle.nf}, градиента - {oracle.ng}, матрицы Гессе - {oracle.nh}")
+    plot(x_min, f_min, history)
 
-# Добавить отображение шагов минимизации
-x_history = np.array(x_history)
-f_history = np.array(f_history)
-ax.plot(x_history[:, 0], x_history[:, 1], f_history, marker='o', color='blue')
 
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Grid(NamedTuple):
+    """
+    Значения функции двух переменных на равномерной сетке.
+
+    x и y - координаты узлов формы (ny, nx) (как у np.meshgrid, но это представления
+    без копирования); z - значения функции той же формы (np.memmap, если сетка кэширована).
+    """
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+
+
+def _resolution(resolution) -> tuple:
+    """
+    Функция, которая приводит разрешение сетки к паре (nx, ny)
+    Args: resolution - число узлов по каждой оси или пара (nx, ny)
+    Return: кортеж (nx, ny)
+    """
+    if np.ndim(resolution) == 0:
+        return int(resolution), int(resolution)
+    nx, ny = resolution
+    return int(nx), int(ny)
+
+
+def _sidecar(cache_path: str) -> str:
+    """
+    Функция, которая возвращает путь к файлу с параметрами кэшированной сетки
+    Args: cache_path - путь к файлу .npy
+    Return: путь к файлу .json рядом с ним
+    """
+    return os.path.splitext(cache_path)[0] + ".json"
+
+
+# repr объектов без собственного repr содержит адрес в памяти и меняется от процесса к процессу
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _hash_value(digest, value):
+    """
+    Функция, которая добавляет значение в хэш так, чтобы ключ не зависел от процесса
+    Args: digest - объект hashlib; value - значение (массивы numpy - по dtype, форме и байтам;
+          кортежи, списки и словари - поэлементно; функции и объекты кода - по коду)
+    Return: отсутствует (ValueError, если значение нельзя описать без адреса в памяти)
+    """
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape}:".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        digest.update(f"{value.dtype.str}:".encode() + value.tobytes())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _hash_value(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode())
+        items = []
+        for key, item in value.items():
+            key_digest = hashlib.sha256()
+            _hash_value(key_digest, key)
+            items.append((key_digest.hexdigest(), item))
+        for key, item in sorted(items, key=lambda pair: pair[0]):
+            digest.update(key.encode())
+            _hash_value(digest, item)
+    elif hasattr(value, "co_code"):
+        digest.update(b"code:" + value.co_code)
+        _hash_value(digest, value.co_consts)
+        _hash_value(digest, value.co_names)
+    elif isinstance(getattr(value, "text", None), str):
+        digest.update(f"{type(value).__name__}:{value.text}".encode())
+    elif hasattr(value, "__code__"):
+        digest.update(f"function:{value.__module__}.{value.__qualname__}:".encode())
+        _hash_value(digest, value.__code__)
+        _hash_value(digest, value.__defaults__)
+        _hash_value(digest, tuple(cell.cell_contents for cell in value.__closure__ or ()))
+    else:
+        text = repr(value)
+        if _ADDRESS.search(text):
+            raise ValueError(f"Не удаётся построить ключ функции по значению {text}: задайте cache_key")
+        digest.update(f"{type(value).__qualname__}:{text}".encode())
+
+
+def _function_key(f) -> str:
+    """
+    Функция, которая строит ключ функции для кэша сетки
+    Args: f - функция
+    Return: строка: для выражений ExpressionEngine - по тексту, для функций Python - по имени,
+            байт-коду, константам, значениям по умолчанию и замыканию (массивы numpy - по содержимому),
+            для прочих объектов - по repr; ValueError, если f или её замыкание нельзя описать
+            без адресов в памяти (тогда ключ задаётся через cache_key)
+    """
+    digest = hashlib.sha256()
+    _hash_value(digest, f)
+    name = getattr(f, "__qualname__", type(f).__qualname__)
+    return f"{name}:{digest.hexdigest()}"
+
+
+def _load_cached(cache_path: str, meta: dict, shape: tuple):
+    """
+    Функция, которая открывает кэшированную сетку, если она построена с теми же параметрами
+    Args: cache_path - путь к файлу .npy; meta - параметры сетки; shape - ожидаемая форма
+    Return: np.memmap только для чтения или None
+    """
+    try:
+        with open(_sidecar(cache_path), encoding="utf-8") as file:
+            if json.load(file) != meta:
+                return None
+        z = np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return z if z.shape == shape else None
+
+
+def evaluate_grid(f, bounds, resolution, chunk_rows: int = None, cache_path: str = None,
+                  cache_key: str = None) -> Grid:
+    """
+    Функция, которая вычисляет функцию двух переменных на равномерной сетке
+    Args: f - функция от массива точек (по первой оси - координаты, f(x) считается через x[0], x[1]);
+          bounds - ((x_min, x_max), (y_min, y_max)); resolution - число узлов по осям (одно или (nx, ny));
+          chunk_rows - сколько строк сетки передавать в f за один вызов (по умолчанию - всю сетку сразу);
+          cache_path - файл .npy, в котором сохраняется поверхность (рядом пишется .json с bounds,
+          resolution и ключом функции; при совпадении всех параметров файл открывается через memmap
+          без вычислений); cache_key - ключ функции (по умолчанию строится по имени, коду и замыканию f; его
+          нужно задать, если f зависит от данных, которых нет в коде, например глобальных переменных,
+          или если её замыкание содержит объекты, которые нельзя описать без адреса в памяти)
+    Return: Grid
+    """
+    (x_min, x_max), (y_min, y_max) = bounds
+    nx, ny = _resolution(resolution)
+    xs = np.linspace(x_min, x_max, nx)
+    ys = np.linspace(y_min, y_max, ny)
+    x, y = np.broadcast_arrays(xs[np.newaxis, :], ys[:, np.newaxis])
+    shape = (ny, nx)
+
+    meta = None
+    if cache_path is not None:
+        meta = {"bounds": [[float(x_min), float(x_max)], [float(y_min), float(y_max)]], "resolution": [nx, ny],
+                "function": _function_key(f) if cache_key is None else str(cache_key)}
+        z = _load_cached(cache_path, meta, shape)
+        if z is not None:
+            return Grid(x, y, z)
+        # Старое описание удаляется заранее, чтобы недописанный файл не был принят за готовый
+        if os.path.exists(_sidecar(cache_path)):
+            os.remove(_sidecar(cache_path))
+        z = np.lib.format.open_memmap(cache_path, mode="w+", dtype=float, shape=shape)
+    else:
+        z = np.empty(shape)
+
+    step = ny if chunk_rows is None else max(1, int(chunk_rows))
+    for start in range(0, ny, step):
+        rows = slice(start, start + step)
+        z[rows] = f(np.stack((x[rows], y[rows])))
+
+    if meta is not None:
+        z.flush()
+        with open(_sidecar(cache_path), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+    return Grid(x, y, z)
@@ -0,0 +1,120 @@
+from typing import NamedTuple
+
+import numpy as np
+
+_solve_triangular = None
+
+
+def _triangular_solver():
+    """
+    Функция, которая при первом вызове импортирует scipy.linalg.solve_triangular
+    Return: функция scipy или False, если scipy не установлен (тогда используется подстановка на numpy)
+    """
+    global _solve_triangular
+    if _solve_triangular is None:
+        try:
+            from scipy.linalg import solve_triangular
+        except ImportError:
+            solve_triangular = False
+        _solve_triangular = solve_triangular
+    return _solve_triangular
+
+
+class CholeskyFactor(NamedTuple):
+    """
+    Разложение Холецкого H + shift * I = L L^T.
+
+    positive_definite - True, если разложилась сама матрица H (shift == 0),
+    то есть H положительно определена.
+    """
+    L: np.ndarray
+    shift: float
+    positive_definite: bool
+
+
+def substitution(L: np.ndarray, b: np.ndarray, lower: bool) -> np.ndarray:
+    """
+    Функция, которая решает систему с треугольной матрицей
+    Args: L - нижняя (lower=True) или верхняя треугольная матрица; b - правая часть
+    Return: решение системы (O(n^2) операций)
+    """
+    solve_triangular = _triangular_solver()
+    if solve_triangular:
+        return solve_triangular(L, b, lower=lower, check_finite=False)
+    n = L.shape[0]
+    y = np.array(b, dtype=float)
+    rows = range(n) if lower else range(n - 1, -1, -1)
+    for i in rows:
+        if lower:
+            y[i] = (y[i] - L[i, :i] @ y[:i]) / L[i, i]
+        else:
+            y[i] = (y[i] - L[i, i + 1:] @ y[i + 1:]) / L[i, i]
+    return y
+
+
+def modified_cholesky(h: np.ndarray, beta: float = 1e-3, max_shifts: int = 60) -> CholeskyFactor:
+    """
+    Функция, которая раскладывает матрицу Гессе, при необходимости сдвигая её на tau * I
+    Args: h - симметричная матрица; beta - начальный сдвиг; max_shifts - максимум попыток
+    Return: CholeskyFactor; для положительно определённой h сдвиг равен 0
+    """
+    h = np.asarray(h, dtype=float)
+    try:
+        return CholeskyFactor(np.linalg.cholesky(h), 0.0, True)
+    except np.linalg.LinAlgError:
+        pass
+    # Модифицированный Холецкий: увеличиваем tau, пока H + tau * I не станет положительно определённой
+    identity = np.eye(h.shape[0])
+    min_diagonal = float(np.min(np.diag(h)))
+    shift = max(beta, beta - min_diagonal)
+    for _ in range(max_shifts):
+        try:
+            return CholeskyFactor(np.linalg.cholesky(h + shift * identity), shift, False)
+        except np.linalg.LinAlgError:
+            shift *= 2
+    raise np.linalg.LinAlgError("Не удалось сделать матрицу Гессе положительно определённой")
+
+
+class HessianCache:
+    """
+    Кэш разложения Холецкого матрицы Гессе для метода Ньютона.
+
+    Разложение пересчитывается только когда матрица изменилась больше, чем на
+    rtol (в норме Фробениуса относительно сохранённой). Счётчики factorizations
+    и reuses показывают, сколько раз разложение строилось и переиспользовалось.
+    """
+
+    def __init__(self, rtol: float = 1e-8, beta: float = 1e-3):
+        self.rtol = rtol
+        self.beta = beta
+        self.factorizations = 0
+        self.reuses = 0
+        self._h = None
+        self._factor = None
+
+    def factor(self, h: np.ndarray) -> CholeskyFactor:
+        """
+        Функция, которая возвращает разложение h, переиспользуя сохранённое при малом изменении h
+        Args: h - матрица Гессе
+        Return: CholeskyFactor
+        """
+        h = np.asarray(h, dtype=float)
+        if self._h is not None and self._h.shape == h.shape:
+            if np.linalg.norm(h - self._h) <= self.rtol * np.linalg.norm(self._h):
+                self.reuses += 1
+                return self._factor
+        self._factor = modified_cholesky(h, self.beta)
+        self._h = h.copy()
+        self.factorizations += 1
+        return self._factor
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Функция, которая решает (H + shift * I) x = b по сохранённому разложению
+        Args: b - правая часть
+        Return: решение x
+        """
+        if self._factor is None:
+            raise RuntimeError("Сначала нужно вызвать factor(h)")
+        L = self._factor.L
+        return substitution(L.T, substitution(L, b, lower=True), lower=False)
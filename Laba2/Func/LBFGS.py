@@ -0,0 +1,199 @@
+import numpy as np
+
+from AutoGrad import gradient
+from LineSearch import strong_wolfe
+from NumericalGradient import numerical_gradient
+from Trace import Iterate, run, snapshot
+
+
+class LBFGSMemory:
+    """
+    Кольцевые буферы пар (s, y) для метода L-BFGS.
+
+    Хранится не более history последних пар s = x_new - x_old, y = grad_new - grad_old
+    в заранее выделенных массивах формы (history, n): новая пара записывается на место
+    самой старой, так что память метода - O(history * n).
+    """
+
+    def __init__(self, n: int, history: int = 10):
+        if history < 1:
+            raise ValueError("Размер истории должен быть положительным")
+        self.history = history
+        self.S = np.zeros((history, n))
+        self.Y = np.zeros((history, n))
+        self.rho = np.zeros(history)
+        self._alpha = np.zeros(history)
+        self._head = 0
+        self.size = 0
+
+    def update(self, s: np.ndarray, y: np.ndarray) -> bool:
+        """
+        Функция, которая добавляет пару (s, y) в буфер
+        Args: s - шаг по x; y - изменение градиента
+        Return: True, если пара сохранена (пары без положительной кривизны (s, y) <= 0 пропускаются)
+        """
+        sy = float(np.dot(s, y))
+        if sy <= 1e-12 * float(np.dot(y, y)):
+            return False
+        i = self._head
+        self.S[i] = s
+        self.Y[i] = y
+        self.rho[i] = 1.0 / sy
+        self._head = (i + 1) % self.history
+        self.size = min(self.size + 1, self.history)
+        return True
+
+    def _order(self) -> range:
+        """Индексы сохранённых пар от самой новой к самой старой."""
+        return range(self._head - 1, self._head - 1 - self.size, -1)
+
+    def direction(self, grad: np.ndarray) -> np.ndarray:
+        """
+        Функция, которая вычисляет направление d = -H grad двухцикловой рекурсией
+        Args: grad - градиент в текущей точке
+        Return: направление спуска d (при пустой истории - антиградиент)
+        """
+        q = np.array(grad, dtype=float)
+        if self.size == 0:
+            return -q
+        S, Y, rho, alpha = self.S, self.Y, self.rho, self._alpha
+        order = self._order()
+        for i in order:
+            alpha[i] = rho[i] * np.dot(S[i], q)
+            q -= alpha[i] * Y[i]
+        # Начальное приближение H_0 = gamma * I по последней паре
+        newest = order[0]
+        q *= 1.0 / (rho[newest] * np.dot(Y[newest], Y[newest]))
+        for i in reversed(order):
+            beta = rho[i] * np.dot(Y[i], q)
+            q += (alpha[i] - beta) * S[i]
+        return -q
+
+
+def lbfgs_iterations(f, grad_f, x_0, epsilon_1: float, epsilon_2: float, m: int, history: int = 10,
+                     hook=None):
+    """
+    Генератор, который ищет минимум методом L-BFGS с шагом по сильным условиям Вольфе
+    Args: f и grad_f - функция и её градиент (если grad_f = None, он считается численно за один
+          вызов f от массива точек); x_0 - начальная точка; epsilon_1 - точность по норме
+          градиента; epsilon_2 - точность по изменению x и f (должна выполниться два раза подряд);
+          m - максимальное количество итераций; history - количество хранимых пар (s, y);
+          hook - объект для сбора метрик (Recorder из Service/Instrumentation.py) или None
+    Return: выдаёт Iterate(k, x, f) в начале каждой итерации; возвращает (x_min, f_min, k)
+    """
+    if grad_f is None:
+        grad_f = numerical_gradient(f)
+    if hook is not None:
+        hook.start("lbfgs")
+    x_0 = np.array(x_0, dtype=float)
+    memory = LBFGSMemory(x_0.shape[0], history)
+    x_new = np.empty_like(x_0)
+    f_x_0 = float(f(x_0))
+    grad_x_0 = np.asarray(grad_f(x_0), dtype=float)
+    k = 0
+    flag = 0
+    while True:
+        if hook is not None:
+            hook.iteration(k, f=f_x_0)
+        yield Iterate(k, snapshot(x_0), f_x_0)
+        #шаг 3-4
+        if np.linalg.norm(grad_x_0) < epsilon_1:
+            break
+        #шаг 5
+        if k >= m:
+            break
+        #шаг 6: направление по истории пар (s, y)
+        if hook is not None:
+            hook.begin("direction")
+        d = memory.direction(grad_x_0)
+        if np.dot(d, grad_x_0) >= 0:
+            # Накопленная история испортилась - начинаем заново с антиградиента
+            memory = LBFGSMemory(x_0.shape[0], history)
+            d = -grad_x_0
+        if hook is not None:
+            hook.end("direction")
+            hook.begin("line_search")
+        #шаг 7: шаг t (первый шаг L-BFGS масштабируется, дальше t_0 = 1)
+        t_0 = 1.0 if memory.size else min(1.0, 1.0 / float(np.linalg.norm(grad_x_0)))
+        step = strong_wolfe(f, grad_f, x_0, d, f_0=f_x_0, g_0=grad_x_0, t_0=t_0)
+        if hook is not None:
+            hook.end("line_search")
+        if step.t == 0:
+            # Ни один пробный шаг не уменьшил f: если шли по антиградиенту, продвинуться
+            # дальше нельзя, иначе история сбрасывается и следующая итерация идёт по антиградиенту
+            if not memory.size:
+                break
+            memory = LBFGSMemory(x_0.shape[0], history)
+            k += 1
+            continue
+        #шаг 8
+        np.multiply(d, step.t, out=x_new)
+        x_new += x_0
+        f_x_new, grad_x_new = step.f_new, step.g_new
+        memory.update(x_new - x_0, grad_x_new - grad_x_0)
+        #шаг 9
+        between_x = float(np.linalg.norm(x_new - x_0))
+        between_f = abs(f_x_new - f_x_0)
+        x_0, x_new = x_new, x_0
+        f_x_0, grad_x_0 = f_x_new, grad_x_new
+        if between_x < epsilon_2 and between_f < epsilon_2:
+            if flag == 1:
+                break
+            flag = 1
+        else:
+            flag = 0
+        k += 1
+    if hook is not None:
+        hook.finish(iterations=k)
+    return x_0.copy(), f_x_0, k
+
+
+def lbfgs(f, grad_f, x_0, epsilon_1: float, epsilon_2: float, m: int, history: int = 10, hook=None):
+    """
+    Функция, которая ищет минимум методом L-BFGS (без сохранения итераций)
+    Args: те же, что у lbfgs_iterations
+    Return: кортеж (x_min, f_min, k)
+    """
+    return run(lbfgs_iterations(f, grad_f, x_0, epsilon_1, epsilon_2, m, history, hook))
+
+
+def f(x: np.ndarray) -> np.ndarray:
+    """
+    Функция двух переменных
+    Args: x - вектор формы (2,) или массив точек формы (2, ...) (по первой оси - координаты)
+    Return: значение функции (число или массив формы (...))
+    """
+    return x[0]**2 + 8*(x[1]**2) + x[0]*x[1] + x[0]
+
+
+def rosenbrock(x: np.ndarray) -> np.ndarray:
+    """
+    Расширенная функция Розенброка - сумма n/2 независимых пар (минимум 0 в точке (1, ..., 1))
+    Args: x - вектор чётной длины n или массив точек формы (n, ...)
+    Return: значение функции (число или массив формы (...))
+    """
+    odd, even = x[0::2], x[1::2]
+    return np.sum(100 * (even - odd**2)**2 + (1 - odd)**2, axis=0)
+
+
+def grad_rosenbrock(x: np.ndarray) -> np.ndarray:
+    """
+    Градиент расширенной функции Розенброка
+    Args: x - вектор чётной длины n
+    Return: вектор градиента
+    """
+    odd, even = x[0::2], x[1::2]
+    inner = even - odd**2
+    grad = np.empty_like(x)
+    grad[0::2] = -400 * odd * inner - 2 * (1 - odd)
+    grad[1::2] = 200 * inner
+    return grad
+
+
+if __name__ == "__main__":
+    x_min, f_min, k = lbfgs(f, gradient(f, 2), np.array([1.5, 0.5]), 0.1, 0.15, 10, history=5)
+    print(f"Координаты точки минимума: {x_min};\n f(x): {f_min};\n k: {k}")
+
+    n = 10000
+    x_min, f_min, k = lbfgs(rosenbrock, grad_rosenbrock, np.tile([-1.2, 1.0], n // 2), 1e-5, 1e-12, 1000)
+    print(f"Розенброк, n = {n}: f(x): {f_min}; |x - 1|: {np.abs(x_min - 1).max()}; k: {k}")
@@ -0,0 +1,199 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class LineSearchResult(NamedTuple):
+    """
+    Результат одномерного поиска шага t вдоль направления d.
+
+    t - найденный шаг; f_evals и g_evals - количество вычислений функции
+    и градиента; f_new и g_new - значения в точке x + t*d, если они были вычислены;
+    success - выполнены ли условия поиска (если нет, t - последний вычисленный шаг,
+    удовлетворяющий условию Армихо, или 0, если такого не нашлось).
+    """
+    t: float
+    f_evals: int
+    g_evals: int
+    f_new: Optional[float] = None
+    g_new: Optional[np.ndarray] = None
+    success: bool = True
+
+
+def exact_step(grad_f, x, d, g=None, hess=None) -> LineSearchResult:
+    """
+    Функция, которая вычисляет точный шаг для квадратичной функции
+    Args: grad_f - градиент; x - текущая точка; d - направление; g - градиент в x (если уже известен);
+          hess - матрица Гессе или функция v -> H v (если не задана, H d берётся из разности градиентов)
+    Return: LineSearchResult с шагом t = -(g, d) / (d, H d)
+    """
+    x = np.asarray(x, dtype=float)
+    d = np.asarray(d, dtype=float)
+    g_evals = 0
+    if g is None:
+        g = np.asarray(grad_f(x), dtype=float)
+        g_evals += 1
+    if hess is None:
+        # Для квадратичной функции grad(x + d) - grad(x) = H d точно
+        hd = np.asarray(grad_f(x + d), dtype=float) - g
+        g_evals += 1
+    elif callable(hess):
+        hd = np.asarray(hess(d), dtype=float)
+    else:
+        hd = np.asarray(hess, dtype=float) @ d
+    curvature = float(np.dot(d, hd))
+    if curvature <= 0:
+        raise ValueError("Функция не выпукла вдоль направления d: точный шаг не определён")
+    return LineSearchResult(-float(np.dot(g, d)) / curvature, 0, g_evals)
+
+
+def armijo(f, x, d, g, f_0=None, t_0=1.0, c_1=1e-4, rho=0.5, max_iter=60) -> LineSearchResult:
+    """
+    Функция, которая ищет шаг дроблением (условие Армихо)
+    Args: f - функция от вектора; x - текущая точка; d - направление спуска; g - градиент в x;
+          f_0 - значение f(x) (если уже известно); t_0 - начальный шаг; c_1 - параметр условия;
+          rho - множитель дробления; max_iter - максимум дроблений
+    Return: LineSearchResult с первым шагом, для которого f(x + t d) <= f(x) + c_1 t (g, d);
+            если за max_iter дроблений такого нет - с последним вычисленным шагом и success=False
+    """
+    x = np.asarray(x, dtype=float)
+    d = np.asarray(d, dtype=float)
+    f_evals = 0
+    if f_0 is None:
+        f_0 = float(f(x))
+        f_evals += 1
+    slope = float(np.dot(g, d))
+    if slope >= 0:
+        raise ValueError("d не является направлением спуска")
+    t = t_0
+    f_t = f_0
+    for i in range(max_iter):
+        if i > 0:
+            t *= rho
+        f_t = float(f(x + t * d))
+        f_evals += 1
+        if f_t <= f_0 + c_1 * t * slope:
+            return LineSearchResult(t, f_evals, 0, f_t)
+    return LineSearchResult(t, f_evals, 0, f_t, success=False)
+
+
+def safeguarded_step(f, grad_f, x, d, g, f_0, hess=None, fallback="wolfe", c_1=1e-4) -> LineSearchResult:
+    """
+    Функция, которая вычисляет точный шаг по квадратичной модели и проверяет его
+    Args: f и grad_f - функция и её градиент; x - текущая точка; d - направление; g и f_0 - градиент
+          и значение f в x; hess - матрица Гессе (или функция v -> H v) либо None; fallback - запасной
+          поиск: "wolfe" (strong_wolfe) или "armijo"; c_1 - параметр условия Армихо
+    Return: LineSearchResult с точным шагом, если кривизна вдоль d положительна и в x + t d выполняется
+            условие Армихо (для квадратичной f это так всегда); иначе - с шагом запасного поиска
+            (счётчики вычислений включают и проверку точного шага)
+
+    Так метод работает на любой функции: на квадратичной шаг остаётся точным, а на невыпуклой
+    (где точный шаг не определён) или сильно нелинейной шаг ищется неточно.
+    """
+    if fallback not in ("wolfe", "armijo"):
+        raise ValueError(f"Неизвестный запасной поиск '{fallback}', доступны: wolfe, armijo")
+    x = np.asarray(x, dtype=float)
+    d = np.asarray(d, dtype=float)
+    f_evals = g_evals = 0
+    try:
+        step = exact_step(grad_f, x, d, g=g, hess=hess)
+    except ValueError:
+        # Кривизна вдоль d неположительна
+        step = None
+    if step is not None:
+        f_t = float(f(x + step.t * d))
+        f_evals, g_evals = 1, step.g_evals
+        if f_t <= f_0 + c_1 * step.t * float(np.dot(g, d)):
+            return LineSearchResult(step.t, f_evals, g_evals, f_t)
+    if fallback == "armijo":
+        result = armijo(f, x, d, g, f_0=f_0, c_1=c_1)
+    else:
+        result = strong_wolfe(f, grad_f, x, d, f_0=f_0, g_0=g, c_1=c_1)
+    return result._replace(f_evals=result.f_evals + f_evals, g_evals=result.g_evals + g_evals)
+
+
+def _interpolate(t_lo, t_hi, f_lo, f_hi, slope_lo):
+    """
+    Функция, которая находит минимум квадратичной интерполяции на [t_lo, t_hi]
+    Args: концы отрезка, значения функции на них и производная в t_lo
+    Return: новый пробный шаг (с защитой от выхода к краям отрезка)
+    """
+    width = t_hi - t_lo
+    denominator = 2 * (f_hi - f_lo - slope_lo * width)
+    t = t_lo - slope_lo * width ** 2 / denominator if denominator > 0 else t_lo + width / 2
+    low, high = sorted((t_lo + 0.1 * width, t_hi - 0.1 * width))
+    if not low <= t <= high:
+        t = t_lo + width / 2
+    return t
+
+
+def strong_wolfe(f, grad_f, x, d, f_0=None, g_0=None, t_0=1.0, c_1=1e-4, c_2=0.9,
+                 t_max=1e10, max_iter=30) -> LineSearchResult:
+    """
+    Функция, которая ищет шаг, удовлетворяющий сильным условиям Вольфе
+    Args: f и grad_f - функция и её градиент; x - текущая точка; d - направление спуска;
+          f_0, g_0 - значения f(x) и grad_f(x) (если уже известны); t_0 - начальный шаг;
+          c_1, c_2 - параметры условий (0 < c_1 < c_2 < 1); t_max - максимальный шаг
+    Return: LineSearchResult с шагом и значениями f, grad_f в новой точке; если шаги закончились
+            раньше, чем выполнились условия, - с лучшим вычисленным шагом (t = 0 и значения в x,
+            если ни один шаг не уменьшил f) и success=False
+    """
+    x = np.asarray(x, dtype=float)
+    d = np.asarray(d, dtype=float)
+    f_evals = g_evals = 0
+    if f_0 is None:
+        f_0 = float(f(x))
+        f_evals += 1
+    if g_0 is None:
+        g_0 = np.asarray(grad_f(x), dtype=float)
+        g_evals += 1
+    slope_0 = float(np.dot(g_0, d))
+    if slope_0 >= 0:
+        raise ValueError("d не является направлением спуска")
+
+    def phi(t):
+        nonlocal f_evals, g_evals
+        point = x + t * d
+        f_t = float(f(point))
+        g_t = np.asarray(grad_f(point), dtype=float)
+        f_evals += 1
+        g_evals += 1
+        return f_t, g_t, float(np.dot(g_t, d))
+
+    def zoom(t_lo, t_hi, f_lo, g_lo, slope_lo, f_hi):
+        for _ in range(max_iter):
+            t = _interpolate(t_lo, t_hi, f_lo, f_hi, slope_lo)
+            f_t, g_t, slope_t = phi(t)
+            if f_t > f_0 + c_1 * t * slope_0 or f_t >= f_lo:
+                t_hi, f_hi = t, f_t
+            else:
+                if abs(slope_t) <= -c_2 * slope_0:
+                    return t, f_t, g_t, True
+                if slope_t * (t_hi - t_lo) >= 0:
+                    t_hi, f_hi = t_lo, f_lo
+                t_lo, f_lo, g_lo, slope_lo = t, f_t, g_t, slope_t
+        # t_lo - лучший вычисленный шаг с условием Армихо (или 0)
+        return t_lo, f_lo, g_lo, False
+
+    t_prev, f_prev, g_prev, slope_prev = 0.0, f_0, g_0, slope_0
+    t = t_0
+    success = True
+    for i in range(max_iter):
+        f_t, g_t, slope_t = phi(t)
+        if f_t > f_0 + c_1 * t * slope_0 or (i > 0 and f_t >= f_prev):
+            t, f_t, g_t, success = zoom(t_prev, t, f_prev, g_prev, slope_prev, f_t)
+            break
+        if abs(slope_t) <= -c_2 * slope_0:
+            break
+        if slope_t >= 0:
+            t, f_t, g_t, success = zoom(t, t_prev, f_t, g_t, slope_t, f_prev)
+            break
+        t_prev, f_prev, g_prev, slope_prev = t, f_t, g_t, slope_t
+        if t >= t_max:
+            break
+        t = min(2 * t, t_max)
+    else:
+        # Шаги закончились во время расширения: возвращается последний вычисленный шаг
+        # (он удовлетворяет условию Армихо) вместе со своими значениями f и градиента
+        t, f_t, g_t, success = t_prev, f_prev, g_prev, False
+    return LineSearchResult(t, f_evals, g_evals, f_t, g_t, success)
@@ -0,0 +1,200 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from AutoGrad import gradient, hessian
+from NumericalGradient import numerical_gradient
+
+
+class MultiStartResult(NamedTuple):
+    """
+    Результат наискорейшего спуска из N начальных точек.
+
+    x - конечные точки формы (N, d) (в порядке начальных точек); fun - значения f в них;
+    iterations - количество итераций для каждой начальной точки; converged - True, если
+    спуск остановился по точности, а не по ограничению m.
+    """
+    x: np.ndarray
+    fun: np.ndarray
+    iterations: np.ndarray
+    converged: np.ndarray
+
+    def best(self, count: int = 1, tol: float = 1e-3) -> np.ndarray:
+        """
+        Функция, которая выбирает лучшие различные минимумы
+        Args: count - сколько минимумов вернуть; tol - точки ближе tol считаются одним минимумом
+        Return: номера начальных точек, приведших к лучшим минимумам (по возрастанию f)
+        """
+        chosen = []
+        for i in np.argsort(self.fun, kind="stable"):
+            if all(np.linalg.norm(self.x[i] - self.x[j]) >= tol for j in chosen):
+                chosen.append(i)
+                if len(chosen) == count:
+                    break
+        return np.array(chosen, dtype=int)
+
+
+def _exact_steps(hess, X: np.ndarray, G: np.ndarray) -> np.ndarray:
+    """
+    Функция, которая вычисляет точные шаги вдоль антиградиентов для всех строк сразу
+    Args: hess - матрица Гессе (d, d) или функция от массива точек (d, n) -> (d, d, n);
+          X и G - точки и градиенты формы (n, d)
+    Return: массив шагов t = (g, g) / (g, H g) формы (n,); для строк с неположительной кривизной
+            (g, H g) <= 0 точный шаг не определён, и там стоит nan
+    """
+    h = hess(X.T) if callable(hess) else np.asarray(hess, dtype=float)
+    if h.ndim == 2:
+        hg = G @ h.T
+    else:
+        hg = np.einsum("ijn,nj->ni", h, G)
+    curvature = np.einsum("ij,ij->i", G, hg)
+    t = np.full(X.shape[0], np.nan)
+    positive = curvature > 0
+    t[positive] = np.einsum("ij,ij->i", G[positive], G[positive]) / curvature[positive]
+    return t
+
+
+def _armijo_steps(f, X: np.ndarray, G: np.ndarray, f_0: np.ndarray, c_1: float, rho: float,
+                  max_iter: int) -> tuple:
+    """
+    Функция, которая дроблением подбирает шаги по условию Армихо для всех строк сразу
+    Args: f - функция; X, G - точки и градиенты формы (n, d); f_0 - значения f в X;
+          c_1 - параметр условия; rho - множитель дробления; max_iter - максимум дроблений
+    Return: кортеж (шаги формы (n,), значения f в X - t G) (на каждом дроблении f вычисляется
+            только для строк, для которых условие ещё не выполнено; если за max_iter дроблений
+            условие не выполнилось, берётся последний вычисленный шаг)
+    """
+    t = np.ones(X.shape[0])
+    f_t = np.empty(X.shape[0])
+    slope = -np.einsum("ij,ij->i", G, G)
+    pending = np.arange(X.shape[0])
+    for i in range(max_iter):
+        if i > 0:
+            t[pending] *= rho
+        trial = X[pending] - t[pending, np.newaxis] * G[pending]
+        f_t[pending] = f(trial.T)
+        ok = f_t[pending] <= f_0[pending] + c_1 * t[pending] * slope[pending]
+        pending = pending[~ok]
+        if pending.size == 0:
+            break
+    return t, f_t
+
+
+def multistart_descent(f, grad_f, starts, epsilon_1: float, epsilon_2: float, m: int, hess=None,
+                       c_1: float = 1e-4, rho: float = 0.5, max_backtracks: int = 40) -> MultiStartResult:
+    """
+    Функция, которая запускает наискорейший спуск сразу из N начальных точек
+    Args: f и grad_f - функция и градиент (принимают массив точек формы (d, n), по первой оси -
+          координаты; если grad_f = None, он считается численно центральными разностями); starts - начальные точки формы (N, d); epsilon_1, epsilon_2, m - те же
+          критерии остановки, что в GradDown.py; hess - матрица Гессе или функция (тогда шаг точный,
+          а там, где кривизна вдоль антиградиента неположительна, и без hess - по условию Армихо);
+          c_1, rho, max_backtracks - параметры дробления шага
+    Return: MultiStartResult
+
+    Все текущие точки хранятся в одном массиве (N, d): активные строки занимают его начало,
+    а остановившиеся меняются местами с последними активными, так что на каждой итерации
+    f и grad_f вызываются один раз для представления X[:n_active] без копирования.
+    Значения f в текущих точках (массив F) переносятся с предыдущей итерации.
+    """
+    if grad_f is None:
+        grad_f = numerical_gradient(f)
+    X = np.array(starts, dtype=float)
+    if X.ndim != 2:
+        raise ValueError("Начальные точки должны быть массивом формы (N, d)")
+    N = X.shape[0]
+    X_new = np.empty_like(X)
+    F = np.asarray(f(X.T), dtype=float).copy()
+    order = np.arange(N)
+    iterations = np.zeros(N, dtype=int)
+    converged = np.zeros(N, dtype=bool)
+    flag = np.zeros(N, dtype=int)
+    n_active = N
+    k = 0
+    while n_active > 0 and k < m:
+        x = X[:n_active]
+        f_x = F[:n_active]
+        G = np.asarray(grad_f(x.T), dtype=float).T
+        #шаг 3-4: строки с малой нормой градиента останавливаются в текущей точке
+        done = np.linalg.norm(G, axis=1) < epsilon_1
+        #шаг 6-7
+        if hess is not None:
+            t = _exact_steps(hess, x, G)
+            fallback = np.flatnonzero(np.isnan(t))
+            if fallback.size:
+                t[fallback] = _armijo_steps(f, x[fallback], G[fallback], f_x[fallback], c_1, rho,
+                                            max_backtracks)[0]
+            f_new = None
+        else:
+            t, f_new = _armijo_steps(f, x, G, f_x, c_1, rho, max_backtracks)
+        x_new = np.multiply(G, -t[:, np.newaxis], out=X_new[:n_active])
+        x_new += x
+        if f_new is None:
+            f_new = np.asarray(f(x_new.T), dtype=float)
+        #шаг 8
+        between_x = np.linalg.norm(x_new - x, axis=1)
+        between_f = np.abs(f_new - f_x)
+        small = ~done & (between_x < epsilon_2) & (between_f < epsilon_2)
+        # Второе подряд выполнение условия останавливает строку в текущей точке, как в GradDown.py
+        done |= small & (flag[:n_active] == 1)
+        flag[:n_active][small] = 1
+        np.copyto(x, x_new, where=~done[:, np.newaxis])
+        np.copyto(f_x, f_new, where=~done)
+        converged[:n_active] = done
+        k += 1
+        iterations[:n_active] = np.where(done, k - 1, k)
+
+        # Остановившиеся строки меняются местами с активными из конца префикса
+        n_keep = n_active - int(done.sum())
+        holes = np.flatnonzero(done[:n_keep])
+        fill = n_keep + np.flatnonzero(~done[n_keep:])
+        if holes.size:
+            for array in (X, F, order, iterations, converged, flag):
+                array[holes], array[fill] = array[fill], array[holes]
+        n_active = n_keep
+
+    result_x = np.empty_like(X)
+    result_x[order] = X
+    result_fun = np.empty_like(F)
+    result_fun[order] = F
+    result_iterations = np.empty_like(iterations)
+    result_iterations[order] = iterations
+    result_converged = np.empty_like(converged)
+    result_converged[order] = converged
+    return MultiStartResult(result_x, result_fun, result_iterations, result_converged)
+
+
+def f(x: np.ndarray) -> np.ndarray:
+    """
+    Функция двух переменных
+    Args: x - вектор формы (2,) или массив точек формы (2, ...) (по первой оси - координаты)
+    Return: значение функции (число или массив формы (...))
+    """
+    return x[0]**2 + 8*(x[1]**2) + x[0]*x[1] + x[0]
+
+
+def himmelblau(x: np.ndarray) -> np.ndarray:
+    """
+    Функция Химмельблау (четыре локальных минимума со значением 0)
+    Args: x - массив точек формы (2, ...)
+    Return: значения функции
+    """
+    return (x[0]**2 + x[1] - 11)**2 + (x[0] + x[1]**2 - 7)**2
+
+
+def main():
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(-5, 5, size=(10000, 2))
+
+    result = multistart_descent(f, gradient(f, 2), starts, 0.1, 0.15, 10, hess=hessian(f, 2))
+    i = result.best()[0]
+    print(f"Координаты точки минимума: {result.x[i]};\n f(x): {result.fun[i]};\n k: {result.iterations[i]}")
+
+    result = multistart_descent(himmelblau, gradient(himmelblau, 2), starts, 1e-6, 1e-12, 1000)
+    print("Химмельблау, начальных точек:", starts.shape[0])
+    print("Сошлось:", int(result.converged.sum()), "; максимум итераций:", int(result.iterations.max()))
+    for i in result.best(4):
+        print(f"  минимум {result.x[i]}, f(x) = {result.fun[i]:.3e}")
+
+
+if __name__ == "__main__":
+    main()
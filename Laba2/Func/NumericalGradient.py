@@ -0,0 +1,128 @@
+import numpy as np
+
+SCHEMES = ("forward", "central", "complex")
+
+# Шаг по умолчанию (относительно max(1, |x_i|)): баланс ошибки аппроксимации и округления
+_EPS = np.finfo(float).eps
+_DEFAULT_STEPS = {"forward": _EPS ** 0.5, "central": _EPS ** (1 / 3), "complex": 1e-20}
+
+
+def _steps(x: np.ndarray, scheme: str, h) -> np.ndarray:
+    """
+    Функция, которая выбирает шаги по координатам
+    Args: x - точка формы (n,) или массив точек формы (n, ...); scheme - схема; h - шаг (число,
+          шаги по координатам или None - тогда шаг выбирается по величине координат)
+    Return: массив шагов формы x.shape
+    """
+    if h is None:
+        h = _DEFAULT_STEPS[scheme] * np.maximum(1.0, np.abs(x))
+    else:
+        h = np.broadcast_to(np.asarray(h, dtype=float).reshape((-1,) + (1,) * (x.ndim - 1)), x.shape)
+    if scheme != "complex":
+        # Шаг, точно представимый в сетке чисел с плавающей точкой вокруг x
+        h = (x + h) - x
+    return h
+
+
+def _differences(f, x, scheme: str, h, with_value: bool) -> tuple:
+    """
+    Функция, которая вычисляет производные по всем координатам одним вызовом f
+    Args: f - функция, принимающая массив точек формы (n, m, ...) (по первой оси - координаты);
+          x - точка формы (n,) или массив точек формы (n, ...); scheme - схема; h - шаг;
+          with_value - нужно ли также значение f(x)
+    Return: кортеж (f(x) или None, градиент формы x.shape)
+
+    Все смещённые точки собираются в один массив: (n + 1) точек для forward, 2n (+ x, если
+    нужно значение) для central и n комплексных точек для complex.
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.shape[0]
+    h = _steps(x, scheme, h)
+    # shifts[i] = h_i * e_i для каждой точки массива
+    shifts = np.eye(n).reshape((n, n) + (1,) * (x.ndim - 1)) * h
+    if scheme == "forward":
+        points = np.concatenate((x[np.newaxis], x + shifts))
+    elif scheme == "central":
+        parts = (x + shifts, x - shifts, x[np.newaxis]) if with_value else (x + shifts, x - shifts)
+        points = np.concatenate(parts)
+    else:
+        points = x + 1j * shifts
+    values = np.asarray(f(np.moveaxis(points, 0, 1)))
+
+    if scheme == "forward":
+        return values[0], (values[1:] - values[0]) / h
+    if scheme == "central":
+        return (values[2 * n] if with_value else None), (values[:n] - values[n:2 * n]) / (2 * h)
+    # Действительная часть f(x + i h e_i) совпадает с f(x) с точностью O(h^2)
+    return values[0].real, values.imag / h
+
+
+def _check(scheme: str):
+    if scheme not in SCHEMES:
+        raise ValueError(f"Неизвестная схема '{scheme}', доступны: {', '.join(SCHEMES)}")
+
+
+def numerical_gradient(f, scheme: str = "central", h=None):
+    """
+    Функция, которая строит численный градиент f
+    Args: f - функция от вектора, умеющая считать сразу массив точек формы (n, m) (как f в
+          лабораторных, записанные через x[0], x[1], ...); scheme - "forward", "central" или
+          "complex" (для complex f должна принимать комплексные числа, функции вроде abs не подходят);
+          h - шаг (по умолчанию выбирается по схеме и величине координат)
+    Return: функция grad(x) -> ndarray для точки (n,) или массива точек (n, ...)
+    """
+    _check(scheme)
+    return lambda x: _differences(f, x, scheme, h, False)[1]
+
+
+def numerical_value_and_gradient(f, scheme: str = "central", h=None):
+    """
+    Функция, которая строит совместное вычисление значения и численного градиента f
+    Args: те же, что у numerical_gradient
+    Return: функция x -> (f(x), grad(x)); значение берётся из того же вызова f, что и разности
+    """
+    _check(scheme)
+    return lambda x: _differences(f, x, scheme, h, True)
+
+
+def numerical_hessian(f, h=None):
+    """
+    Функция, которая строит численную матрицу Гессе f (центральные разности второго порядка)
+    Args: f - функция, умеющая считать массив точек; h - шаг (по умолчанию eps^(1/4) * max(1, |x_i|))
+    Return: функция hess(x) -> ndarray формы (n, n) для точки формы (n,)
+
+    H_ij = (f(x + h_i e_i + h_j e_j) - f(x + h_i e_i - h_j e_j) - f(x - h_i e_i + h_j e_j)
+            + f(x - h_i e_i - h_j e_j)) / (4 h_i h_j); все 4n^2 точек считаются одним вызовом f.
+    """
+    def hess(x):
+        x = np.asarray(x, dtype=float)
+        n = x.shape[0]
+        steps = _EPS ** 0.25 * np.maximum(1.0, np.abs(x)) if h is None else np.broadcast_to(h, x.shape)
+        steps = (x + steps) - x
+        shifts = np.diag(steps)
+        signs = np.array([1.0, -1.0])
+        # points[a, b, i, j] = x + s_a h_i e_i + s_b h_j e_j
+        points = (x + signs[:, None, None, None, None] * shifts[None, None, :, None, :]
+                  + signs[None, :, None, None, None] * shifts[None, None, None, :, :])
+        values = np.asarray(f(points.reshape(-1, n).T)).reshape(2, 2, n, n)
+        return (values[0, 0] - values[0, 1] - values[1, 0] + values[1, 1]) / (4 * np.outer(steps, steps))
+    return hess
+
+
+def gradient_hessian(grad_f, h=None):
+    """
+    Функция, которая строит численную матрицу Гессе по известному градиенту (центральные разности)
+    Args: grad_f - градиент (функция от точки формы (n,)); h - шаг (по умолчанию eps^(1/3) * max(1, |x_i|))
+    Return: функция hess(x) -> ndarray формы (n, n) для точки формы (n,)
+
+    Столбец i - (grad(x + h_i e_i) - grad(x - h_i e_i)) / (2 h_i), всего 2n вызовов grad_f;
+    результат симметризуется.
+    """
+    def hess(x):
+        x = np.asarray(x, dtype=float)
+        steps = _steps(x, "central", h)
+        columns = [(np.asarray(grad_f(x + step * e), dtype=float) - np.asarray(grad_f(x - step * e), dtype=float))
+                   / (2 * step) for step, e in zip(steps, np.eye(x.shape[0]))]
+        matrix = np.column_stack(columns)
+        return (matrix + matrix.T) / 2
+    return hess
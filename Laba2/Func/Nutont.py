@@ -1,205 +1,248 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
-def create_x_range() -> list[list[float]]:
+from AutoGrad import gradient, hessian
+from Grid import evaluate_grid
+from HessianCache import HessianCache
+from LineSearch import armijo
+from Oracle import Oracle
+from Trace import Iterate, RingHistory, run, snapshot
+
+def f(x: np.ndarray) -> np.ndarray:
     """
-    Функция, которая создаёт диапазон для функции
-    Args: отсутствует
-    Return: список списков с точками
+    Функция двух переменных
+    Args: x - вектор формы (2,) или массив точек формы (2, ...) (по первой оси - координаты)
+    Return: значение функции (число или массив формы (...))
     """
-    x_range = []
-    step = 10 / 500
-    for i in range(1000):
-        x_range.append([-5 + (step * i), -5 + (step * i)])
-    return x_range
+    return x[0]**2 + 8*(x[1]**2) + x[0]*x[1] + x[0]
 
-def f(x_list: list[list[float]]) -> list[float]:
+def grad_f(x: np.ndarray) -> np.ndarray:
     """
-    Функция двух переменных
-    Args: x - список значений x
-    Return: список значений функции
+    Функция, которая вычисляет градиент f
+    Args: x - вектор формы (2,) или массив точек формы (2, ...)
+    Return: градиент (строится по формуле f автоматически при первом вызове и компилируется один раз)
     """
-    result = []
-    for x in x_list:
-        result.append([x[0]**2 + 8*(x[1]**2) + x[0]*x[1] + x[0]])
-    return result
+    return gradient(f, 2)(x)
 
-def grad_f(x: list[float]) -> list[float]:
+def hess_f(x: np.ndarray) -> np.ndarray:
     """
-    Функция, которая считает градиент функции f
-    Args: x - аргумент функции
-    Return: список значений
+    Функция, которая вычисляет матрицу Гессе f
+    Args: x - вектор формы (2,)
+    Return: матрица Гессе (строится так же, как градиент, при первом вызове)
     """
-    return [2*x[0] + x[1] + 1, 16*x[1] + x[0]]
+    return hessian(f, 2)(x)
 
-def norm_grad(grad: list[float]) -> float:
+def norm_grad(grad: np.ndarray) -> float:
     """
     Функция, которая считает норму градиента
     Args: grad - градиент функции
     Return: значение нормы градиента функции
     """
-    return np.sqrt(grad[0]**2 + grad[1]**2)
+    return float(np.linalg.norm(grad))
 
 
-def reverse_mat(h: list[list[float]]) -> list[list[float]]:
-    """
-    Функция, которая вычисляет обратную матрицу
-    Args: h - матрица Гиссе
-    Return: обратная матрица
-    """
-    return np.linalg.inv(h)
-
-def calculate_deltas(h: list[list[float]]) -> list[float]:
-    """
-    Функция, которая вычисляет 2 дельты матрицы
-    Args: h - матрица Гиссе
-    Return: список из двух дельт
-    """
-    return [h[0][0], np.linalg.det(h)]
-
-def calculate_d(x: list[float], h: list[list[float]]) -> list[float]:
+def calculate_d(grad: np.ndarray, hessian_cache: HessianCache) -> np.ndarray:
     """
     Функция, которая вычисляет вектор d
-    Args: x - список значений, h - матрица Гиссе (уже обратная)
-    Return: список d
+    Args: grad - градиент в текущей точке, hessian_cache - кэш с разложением Холецкого матрицы Гессе
+    Return: вектор d = -H^(-1) grad (для не положительно определённой H - по разложению H + tau*I)
     """
-    return np.dot(-h, grad_f(x))
+    return -hessian_cache.solve(grad)
 
 
-def calculate_t(x: list[float]) -> float:
+def calculate_t(x: np.ndarray, d: np.ndarray, grad: np.ndarray, f_x: float, value=f) -> float:
     """
     Функция, которая вычисляет значение t на какой-то итерации
-    Args: x - аргумент
-    Return: значение t
+    Args: x - аргумент; d - направление спуска; grad и f_x - градиент и значение f в точке x;
+          value - функция для вычисления f в пробных точках (например, оракул)
+    Return: значение t (дробление шага по условию Армихо)
     """
-    return (2*x[0]*(2*x[0]+x[1]+1) + 16*x[1]*(16*x[1]+x[0]) + x[1]*(2*x[0]+x[1]+1) + x[0]*(16*x[1]+x[0]) + 2*x[0]+x[1]+1) / (2*((2*x[0]+x[1]+1)**2) + 16*((16*x[1]+x[0])**2) + 2*(2*x[0]+x[1]+1)*(16*x[1]+x[0]))
+    return armijo(value, x, d, grad, f_0=f_x).t
 
-def calculate_x_new(x_old: list[float], t: float, d: list[float]) -> list[float]:
+def calculate_x_new(x_old: np.ndarray, t: float, d: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     """
     Функция, которая вычисляет новое значение вектора x
-    Args: x_old - предыдущее значение вектора x; t - коэффициент t; d - коэффициент d
+    Args: x_old - предыдущее значение вектора x; t - коэффициент t; d - коэффициент d;
+          out - массив, в который записывается результат (если не задан, создаётся новый)
     Return: новый вектор x
     """
-    return np.array(x_old) + t * np.array(d)
+    out = np.multiply(d, t, out=out)
+    out += x_old
+    return out
 
-def norm_between_x(x_old: list[float], x_new: list[float]) -> float:
+def norm_between_x(x_old: np.ndarray, x_new: np.ndarray) -> float:
     """
     Функция, которая вычисляет норму между новым и старым х
     Args: x_old и x_new - старый и новый х
     Return: значение нормы
     """
-    return np.sqrt((x_new[0] - x_old[0])**2 + (x_new[1] - x_old[1])**2)
+    return float(np.linalg.norm(np.subtract(x_new, x_old)))
 
-def mod_between_f(x_old: list[float], x_new: list[float]) -> float:
+def mod_between_f(f_old: float, f_new: float) -> float:
     """
     Функция, которая вычисляет модуль между разницей новой и старой f
-    Args: x_old и x_new - старый и новый х
+    Args: f_old и f_new - значения f в старом и новом х (уже вычисленные оракулом)
     Return: значение модуля
     """
-    return abs(f(x_new)[0][0] - f(x_old)[0][0])
-
+    return abs(f_new - f_old)
 
-# Создать списки для сохранения значений x и f(x)
-x_history = []
-f_history = []
 
+def newton(x_0: np.ndarray, epsilon_1: float, epsilon_2: float, m: int, oracle: Oracle = None,
+           hook=None):
+    """
+    Генератор, который выполняет метод Ньютона, выдавая состояние на каждой итерации
+    Args: x_0 - начальная точка; epsilon_1, epsilon_2 - точности; m - максимальное количество итераций;
+          oracle - оракул f (по умолчанию строится по формуле f; в нём же считаются вычисления);
+          hook - объект для сбора метрик (Recorder из Service/Instrumentation.py) или None
+    Return: выдаёт Iterate(k, x, f) в начале каждой итерации; возвращает (x_min, f_min, k)
+    """
+    oracle = Oracle.from_expression(f, 2) if oracle is None else oracle
+    if hook is not None:
+        hook.start("newton")
+    x_0 = np.array(x_0, dtype=float)
+    x_new = np.empty_like(x_0)
+    k = 0
+    hessian_cache = HessianCache()
+    flag = 0
 
-x_0 = [1.5, 0.5]
-epsilon_1 = 0.1
-epsilon_2 = 0.15
-m = 10
-k = 0
-h = [[2, 1], [1, 16]]
-flag = 0
-
-while k < m:
+    while k < m:
 
-    # Добавить текущее значение x и f(x) в историю
-    x_history.append(x_0)
-    f_history.append(f([x_0])[0][0])
+        #шаг 3: значение и градиент в x_0 (в точке x_new они уже вычислены на прошлой итерации)
+        f_x_0, grad_f_x_0 = oracle.value_and_grad(x_0)
+        if hook is not None:
+            hook.iteration(k, f=f_x_0, nf=oracle.nf, ng=oracle.ng, nh=oracle.nh)
+        # Выдать текущее состояние (история хранится у вызывающего кода)
+        yield Iterate(k, snapshot(x_0), f_x_0)
 
-    #шаг 3
-    grad_f_x_0 = grad_f(x_0)
-    #шаг 4
-    norm_grad_f_x_0 = norm_grad(grad_f_x_0)
-    if norm_grad_f_x_0 < epsilon_1:
-        x_min = x_0
-        f_min = f([x_min])
-        break
-    else:
-        #шаг 5
-        if k >= m:
+        #шаг 4
+        norm_grad_f_x_0 = norm_grad(grad_f_x_0)
+        if norm_grad_f_x_0 < epsilon_1:
             x_min = x_0
-            f_min = f(x_min)
+            f_min = f_x_0
             break
         else:
-            #шаг 6-7
-            h_reverse = reverse_mat(h)
-            #шаг 8
-            deltas_h_reverse = calculate_deltas(h_reverse)
-            if deltas_h_reverse[0] > 0 and deltas_h_reverse[1] > 0:
-                #шаг 9
-                d = calculate_d(x_0, h_reverse)
-                #шаг 10
-                x_new = calculate_x_new(x_0, 1, d)
-                #шаг 11
-                between_x = norm_between_x(x_0, x_new)
-                between_f = mod_between_f([x_0], [x_new])
-                if between_x < epsilon_2 and between_f < epsilon_2:
-                    if flag == 1:
-                        flag = 2
-                        x_min = x_new
-                        f_min = f(x_min)
-                        break
+            #шаг 5
+            if k >= m:
+                x_min = x_0
+                f_min = f_x_0
+                break
+            else:
+                #шаг 6-8: разложение Холецкого одновременно проверяет положительную определённость H
+                #и переиспользуется, пока H не меняется
+                if hook is not None:
+                    hook.begin("hessian")
+                h_factor = hessian_cache.factor(oracle.hessian(x_0))
+                if hook is not None:
+                    hook.end("hessian")
+                    hook.begin("direction")
+                d = calculate_d(grad_f_x_0, hessian_cache)
+                if hook is not None:
+                    hook.end("direction")
+                if h_factor.positive_definite:
+                    #шаг 9
+                    #шаг 10
+                    x_new = calculate_x_new(x_0, 1, d, out=x_new)
+                    #шаг 11
+                    between_x = norm_between_x(x_0, x_new)
+                    f_x_new = oracle.value_and_grad(x_new)[0]
+                    between_f = mod_between_f(f_x_0, f_x_new)
+                    if between_x < epsilon_2 and between_f < epsilon_2:
+                        if flag == 1:
+                            flag = 2
+                            x_min = x_new
+                            f_min = f_x_new
+                            break
+                        else:
+                            flag = 1
+                            x_0, x_new = x_new, x_0
+                            k += 1
                     else:
-                        flag = 1
-                        x_0 = x_new
+                        x_0, x_new = x_new, x_0
                         k += 1
                 else:
-                    x_0 = x_new
-                    k += 1
-            else:
-                #шаг 8 б
-                d = -grad_f_x_0
-                t = calculate_t(x_0)
-                #шаг 10
-                x_new = calculate_x_new(x_0, t, d)
-                #шаг 11
-                between_x = norm_between_x(x_0, x_new)
-                between_f = mod_between_f([x_0], [x_new])
-                if between_x < epsilon_2 and between_f < epsilon_2:
-                    if flag == 1:
-                        flag = 2
-                        x_min = x_new
-                        f_min = f(x_min)
-                        break
+                    #шаг 8 б: d построено по H + tau*I (модифицированный Холецкий), шаг выбирается дроблением
+                    if hook is not None:
+                        hook.begin("line_search")
+                    t = calculate_t(x_0, d, grad_f_x_0, f_x_0, oracle.value)
+                    if hook is not None:
+                        hook.end("line_search")
+                    #шаг 10
+                    x_new = calculate_x_new(x_0, t, d, out=x_new)
+                    #шаг 11
+                    between_x = norm_between_x(x_0, x_new)
+                    f_x_new = oracle.value_and_grad(x_new)[0]
+                    between_f = mod_between_f(f_x_0, f_x_new)
+                    if between_x < epsilon_2 and between_f < epsilon_2:
+                        if flag == 1:
+                            flag = 2
+                            x_min = x_new
+                            f_min = f_x_new
+                            break
+                        else:
+                            flag = 1
+                            x_0, x_new = x_new, x_0
+                            k += 1
                     else:
-                        flag = 1
-                        x_0 = x_new
+                        x_0, x_new = x_new, x_0
                         k += 1
-                else:
-                    x_0 = x_new
-                    k += 1
+    else:
+        # Достигнуто ограничение m: минимумом считается последняя точка
+        x_min = x_0
+        f_min = oracle.value(x_min)
+    if hook is not None:
+        hook.finish(iterations=k, nf=oracle.nf, ng=oracle.ng, nh=oracle.nh)
+    return x_min.copy(), f_min, k
+
+
+def minimize(x_0: np.ndarray, epsilon_1: float = 0.1, epsilon_2: float = 0.15, m: int = 10,
+             consumers: tuple = (), oracle: Oracle = None, hook=None) -> tuple:
+    """
+    Функция, которая ищет минимум f, начиная с x_0
+    Args: x_0 - начальная точка; epsilon_1, epsilon_2 - точности; m - максимальное количество итераций;
+          consumers - функции, которые получают состояние Iterate на каждой итерации;
+          oracle - оракул f (его счётчики nf, ng, nh показывают число вычислений за запуск);
+          hook - объект для сбора метрик по итерациям и участкам (line_search, direction, hessian)
+    Return: кортеж (x_min, f_min, k)
+    """
+    return run(newton(x_0, epsilon_1, epsilon_2, m, oracle, hook), *consumers)
+
+
+def plot(x_min: np.ndarray, f_min: float, history: RingHistory):
+    """
+    Функция, которая рисует поверхность f, точку минимума и шаги метода
+    Args: x_min, f_min - найденный минимум; history - история итераций
+    Return: отсутствует
+    """
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+
+    x, y, z = evaluate_grid(f, ((-5, 5), (-5, 5)), 500)
+
+    fig = plt.figure()
+    ax = fig.add_subplot(1, 1, 1, projection="3d")
+    ax.plot_surface(x, y, z, cmap='viridis', alpha=0.6)
+    ax.scatter(x_min[0], x_min[1], f_min, color="red")
+
+    # Добавить отображение шагов минимизации
+    ax.plot(history.x[:, 0], history.x[:, 1], history.f, marker='o', color='blue')
+
+    plt.show()
 
-print(f"Координаты точки минимума: {x_min};\n f(x): {f_min};\n k: {k}")
 
-# Изменить часть для построения графика
-x_range = create_x_range()
-x1_values = np.array([x_range[i][0] for i in range(len(x_range))])
-x2_values = x1_values.copy()
+def main():
+    x_0 = np.array([1.5, 0.5])
+    epsilon_1 = 0.1
+    epsilon_2 = 0.15
+    m = 10
 
-x, y = np.meshgrid(x1_values, x2_values)
-z = np.array(f(x_range))
+    # История ограничена m + 1 последними итерациями и заполняется по ходу работы метода
+    history = RingHistory(m + 1, x_0.shape[0])
+    oracle = Oracle.from_expression(f, 2)
+    x_min, f_min, k = minimize(x_0, epsilon_1, epsilon_2, m, consumers=(history,), oracle=oracle)
 
-fig = plt.figure()
-ax = fig.add_subplot(1, 1, 1, projection="3d")
-ax.plot_surface(x, y, z, cmap='viridis', alpha=0.6)
-ax.scatter(x_min[0], x_min[1], f_min, color="red")
+    print(f"Координаты точки минимума: {x_min};\n f(x): {f_min};\n k: {k}")
+    print(f"Количество вычислений: f - {oracle.nf}, градиента - {oracle.ng}, матрицы Гессе - {oracle.nh}")
+    plot(x_min, f_min, history)
 
-# Добавить отображение шагов минимизации
-x_history = np.array(x_history)
-f_history = np.array(f_history)
-ax.plot(x_history[:, 0], x_history[:, 1], f_history, marker='o', color='blue')
 
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
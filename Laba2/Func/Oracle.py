@@ -0,0 +1,156 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from NumericalGradient import gradient_hessian, numerical_gradient, numerical_hessian, numerical_value_and_gradient
+
+
+class Oracle:
+    """
+    Оракул функции: значение, градиент и матрица Гессе с запоминанием последних точек.
+
+    Для memory последних точек (ключ - байты вектора x) хранятся уже вычисленные f, grad и H,
+    так что повторный запрос в той же точке ничего не вычисляет. Если задана функция
+    value_and_grad, значение и градиент считаются одним совместным вызовом. Счётчики nf, ng, nh
+    показывают, сколько раз реально вычислялись f, градиент и матрица Гессе. Если grad_f не задан,
+    градиент считается численно (центральными разностями, см. NumericalGradient.py). Если не задан
+    hess, атрибут hess остаётся None (методы первого порядка тогда не запрашивают матрицу Гессе),
+    а hessian() считает её численно: разностями градиента grad_f или, если не задан и он,
+    вторыми разностями f.
+    """
+
+    def __init__(self, f, grad_f=None, hess=None, memory: int = 4, value_and_grad=None):
+        if memory < 1:
+            raise ValueError("memory должно быть положительным")
+        if grad_f is None:
+            self._numerical_hess = numerical_hessian(f)
+            grad_f = numerical_gradient(f)
+            if value_and_grad is None:
+                value_and_grad = numerical_value_and_gradient(f)
+        else:
+            self._numerical_hess = gradient_hessian(grad_f)
+        self.f = f
+        self.grad_f = grad_f
+        self.hess = hess
+        self.memory = memory
+        self.fused = value_and_grad
+        self.nf = 0
+        self.ng = 0
+        self.nh = 0
+        self._points = OrderedDict()
+
+    @classmethod
+    def from_expression(cls, f, n_vars: int, memory: int = 4) -> "Oracle":
+        """
+        Функция, которая строит оракул по формуле f через AutoGrad
+        Args: f - функция от вектора (через x[0], x[1], ...); n_vars - количество переменных;
+              memory - сколько последних точек помнить
+        Return: Oracle с совместным вычислением значения и градиента (компилируется при первом вызове)
+        """
+        from AutoGrad import gradient, hessian, value_and_gradient
+        return cls(f, lambda x: gradient(f, n_vars)(x), lambda x: hessian(f, n_vars)(x), memory,
+                   lambda x: value_and_gradient(f, n_vars)(x))
+
+    @classmethod
+    def from_function(cls, f, scheme: str = "central", h=None, memory: int = 4) -> "Oracle":
+        """
+        Функция, которая строит оракул для функции без формулы (чёрного ящика)
+        Args: f - функция от вектора, умеющая считать массив точек формы (n, m); scheme - схема
+              численного градиента ("forward", "central", "complex"); h - шаг; memory - сколько
+              последних точек помнить
+        Return: Oracle с численными градиентом и матрицей Гессе (каждая - за один вызов f)
+        """
+        return cls(f, numerical_gradient(f, scheme, h), numerical_hessian(f), memory,
+                   numerical_value_and_gradient(f, scheme, h))
+
+    def _entry(self, x) -> tuple:
+        """
+        Функция, которая находит (или заводит) запись для точки x
+        Args: x - точка
+        Return: кортеж (x в виде массива float, словарь с уже вычисленными величинами)
+        """
+        x = np.asarray(x, dtype=float)
+        key = x.tobytes()
+        points = self._points
+        entry = points.get(key)
+        if entry is not None:
+            points.move_to_end(key)
+            return x, entry
+        entry = points[key] = {}
+        if len(points) > self.memory:
+            points.popitem(last=False)
+        return x, entry
+
+    def _fused(self, x: np.ndarray, entry: dict):
+        """Вычисляет значение и градиент одним вызовом."""
+        value, grad = self.fused(x)
+        grad = np.array(grad, dtype=float)
+        grad.flags.writeable = False
+        entry["f"] = float(value)
+        entry["g"] = grad
+        self.nf += 1
+        self.ng += 1
+
+    def value(self, x) -> float:
+        """
+        Функция, которая возвращает f(x)
+        Args: x - точка
+        Return: значение функции
+        """
+        x, entry = self._entry(x)
+        if "f" not in entry:
+            entry["f"] = float(self.f(x))
+            self.nf += 1
+        return entry["f"]
+
+    __call__ = value
+
+    def grad(self, x) -> np.ndarray:
+        """
+        Функция, которая возвращает градиент f в точке x
+        Args: x - точка
+        Return: градиент (массив только для чтения)
+        """
+        x, entry = self._entry(x)
+        if "g" not in entry:
+            if self.fused is not None and "f" not in entry:
+                self._fused(x, entry)
+            else:
+                grad = np.array(self.grad_f(x), dtype=float)
+                grad.flags.writeable = False
+                entry["g"] = grad
+                self.ng += 1
+        return entry["g"]
+
+    def value_and_grad(self, x) -> tuple:
+        """
+        Функция, которая возвращает f(x) и градиент в точке x
+        Args: x - точка
+        Return: кортеж (значение, градиент)
+        """
+        x, entry = self._entry(x)
+        if "f" not in entry and "g" not in entry and self.fused is not None:
+            self._fused(x, entry)
+        return self.value(x), self.grad(x)
+
+    def hessian(self, x) -> np.ndarray:
+        """
+        Функция, которая возвращает матрицу Гессе f в точке x
+        Args: x - точка
+        Return: матрица Гессе (численная, если hess не задан)
+        """
+        hess = self.hess if self.hess is not None else self._numerical_hess
+        x, entry = self._entry(x)
+        if "h" not in entry:
+            entry["h"] = np.asarray(hess(x), dtype=float)
+            self.nh += 1
+        return entry["h"]
+
+    def reset_counters(self):
+        """Обнуляет счётчики вычислений, сохраняя запомненные точки."""
+        self.nf = 0
+        self.ng = 0
+        self.nh = 0
+
+    def __repr__(self):
+        return f"Oracle(nf={self.nf}, ng={self.ng}, nh={self.nh})"
@@ -0,0 +1,183 @@
+import zipfile
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Iterate(NamedTuple):
+    """
+    Состояние метода на одной итерации.
+
+    k - номер итерации; x - текущая точка (копия только для чтения, см. snapshot,
+    поэтому состояния можно сохранять, не копируя); f - значение функции в x.
+    """
+    k: int
+    x: np.ndarray
+    f: float
+
+
+def snapshot(x: np.ndarray) -> np.ndarray:
+    """
+    Функция, которая копирует рабочую точку метода для выдачи в Iterate
+    Args: x - рабочий буфер метода (меняется на следующих итерациях)
+    Return: копия x только для чтения
+    """
+    x = x.copy()
+    x.flags.writeable = False
+    return x
+
+
+def run(solver, *consumers):
+    """
+    Функция, которая выполняет генератор-метод до конца
+    Args: solver - генератор, выдающий Iterate; consumers - функции, получающие каждое состояние
+    Return: значение, возвращённое генератором (обычно (x_min, f_min, k))
+    """
+    while True:
+        try:
+            state = next(solver)
+        except StopIteration as stop:
+            return stop.value
+        for consumer in consumers:
+            consumer(state)
+
+
+class RingHistory:
+    """
+    История итераций ограниченного размера.
+
+    Хранятся последние capacity сохранённых состояний в заранее выделенных массивах;
+    при stride > 1 сохраняется только каждая stride-я итерация (прореживание).
+    """
+
+    def __init__(self, capacity: int, dimension: int, stride: int = 1):
+        if capacity < 1 or stride < 1:
+            raise ValueError("capacity и stride должны быть положительными")
+        self.capacity = capacity
+        self.stride = stride
+        self._k = np.zeros(capacity, dtype=int)
+        self._x = np.zeros((capacity, dimension))
+        self._f = np.zeros(capacity)
+        self._count = 0
+
+    def append(self, state: Iterate):
+        """
+        Функция, которая сохраняет состояние (копируя точку в буфер)
+        Args: state - состояние метода
+        Return: отсутствует
+        """
+        if state.k % self.stride:
+            return
+        i = self._count % self.capacity
+        self._k[i] = state.k
+        self._x[i] = state.x
+        self._f[i] = state.f
+        self._count += 1
+
+    __call__ = append
+
+    def _ordered(self, array: np.ndarray) -> np.ndarray:
+        """Сохранённые значения в порядке итераций."""
+        if self._count <= self.capacity:
+            return array[:self._count]
+        i = self._count % self.capacity
+        return np.concatenate((array[i:], array[:i]))
+
+    @property
+    def k(self) -> np.ndarray:
+        return self._ordered(self._k)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._ordered(self._x)
+
+    @property
+    def f(self) -> np.ndarray:
+        return self._ordered(self._f)
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+
+class TraceWriter:
+    """
+    Запись итераций в бинарный файл трассы по мере работы метода.
+
+    Состояния накапливаются в буферах по chunk_size штук, и каждый заполненный буфер
+    дописывается в zip-архив .npz отдельными массивами k_00000, x_00000, f_00000, ...,
+    так что в памяти одновременно находится не больше одного блока. Файл читается
+    через read_trace или np.load.
+    """
+
+    def __init__(self, path: str, dimension: int, chunk_size: int = 1024, stride: int = 1,
+                 compress: bool = False):
+        if chunk_size < 1 or stride < 1:
+            raise ValueError("chunk_size и stride должны быть положительными")
+        self.path = path
+        self.stride = stride
+        self.chunks = 0
+        self._k = np.zeros(chunk_size, dtype=int)
+        self._x = np.zeros((chunk_size, dimension))
+        self._f = np.zeros(chunk_size)
+        self._size = 0
+        self._archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+
+    def append(self, state: Iterate):
+        """
+        Функция, которая добавляет состояние в трассу
+        Args: state - состояние метода
+        Return: отсутствует
+        """
+        if state.k % self.stride:
+            return
+        i = self._size
+        self._k[i] = state.k
+        self._x[i] = state.x
+        self._f[i] = state.f
+        self._size += 1
+        if self._size == self._k.shape[0]:
+            self.flush()
+
+    __call__ = append
+
+    def flush(self):
+        """
+        Функция, которая дописывает накопленный блок в архив
+        Return: отсутствует
+        """
+        if self._size == 0:
+            return
+        for name, array in (("k", self._k), ("x", self._x), ("f", self._f)):
+            with self._archive.open(f"{name}_{self.chunks:05d}.npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array(member, array[:self._size], allow_pickle=False)
+        self.chunks += 1
+        self._size = 0
+
+    def close(self):
+        """
+        Функция, которая записывает остаток и закрывает файл
+        Return: отсутствует
+        """
+        if self._archive is not None:
+            self.flush()
+            self._archive.close()
+            self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_trace(path: str) -> tuple:
+    """
+    Функция, которая читает файл трассы, записанный TraceWriter
+    Args: path - путь к файлу .npz
+    Return: кортеж массивов (k, x, f) в порядке итераций
+    """
+    with np.load(path) as trace:
+        chunks = sorted({name.split("_")[1] for name in trace.files})
+        if not chunks:
+            return np.zeros(0, dtype=int), np.zeros((0, 0)), np.zeros(0)
+        return tuple(np.concatenate([trace[f"{name}_{chunk}"] for chunk in chunks]) for name in ("k", "x", "f"))
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import FletcheraRivsa
+import GradDown
+import NutonRafson
+import Nutont
+from Oracle import Oracle
+
+# Минимум f(x) = x0^2 + 8 x1^2 + x0 x1 + x0: решение H x = -b
+MINIMUM = np.array([-16 / 31, 1 / 31])
+
+
+@pytest.mark.parametrize("module", [GradDown, FletcheraRivsa, Nutont, NutonRafson],
+                         ids=lambda module: module.__name__)
+def test_minimize_with_numerical_oracle(module):
+    oracle = Oracle(module.f)
+    x_min, f_min, k = module.minimize(np.array([1.5, 0.5]), 1e-6, 1e-9, 200, oracle=oracle)
+    np.testing.assert_allclose(x_min, MINIMUM, atol=1e-5)
+    assert f_min == pytest.approx(module.f(MINIMUM), abs=1e-9)
+    assert k >= 1
+
+
+@pytest.mark.parametrize("module", [GradDown, FletcheraRivsa], ids=lambda module: module.__name__)
+def test_first_order_methods_do_not_request_hessian(module):
+    oracle = Oracle(module.f)
+    module.minimize(np.array([1.5, 0.5]), 1e-6, 1e-9, 200, oracle=oracle)
+    assert oracle.nh == 0
+
+
+def test_numerical_hessian_fallback():
+    quadratic = Oracle(GradDown.f, GradDown.grad_f)
+    expected = np.array([[2.0, 1.0], [1.0, 16.0]])
+    np.testing.assert_allclose(Oracle(GradDown.f).hessian(np.array([0.3, -0.2])), expected, rtol=1e-6)
+    np.testing.assert_allclose(quadratic.hessian(np.array([0.3, -0.2])), expected, rtol=1e-6)
+    assert quadratic.hess is None and quadratic.nh == 1
+
+
+def test_collected_iterates_keep_their_points():
+    states = list(GradDown.gradient_descent(np.array([1.5, 0.5]), 1e-6, 1e-9, 50, Oracle(GradDown.f)))
+    assert len(states) > 2
+    for state in states:
+        assert state.f == pytest.approx(GradDown.f(state.x), abs=1e-12)
+        assert not state.x.flags.writeable
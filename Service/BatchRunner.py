@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _directory in (os.path.join(_ROOT, "Laba1", "python"), os.path.join(_ROOT, "Laba2", "Func")):
+    if _directory not in sys.path:
+        sys.path.insert(0, _directory)
+
+# Методы одной переменной (Laba1) и методы многих переменных (Laba2): имя -> модуль
+SCALAR_METHODS = ("dichotomy", "golden", "fibonacci", "brent")
+VECTOR_METHODS = {
+    "gradient_descent": "GradDown",
+    "fletcher_reeves": "FletcheraRivsa",
+    "newton": "Nutont",
+    "newton_raphson": "NutonRafson",
+    "lbfgs": "LBFGS",
+}
+
+
+class JobTimeout(Exception):
+    """Задача не уложилась в отведённое время."""
+
+
+class JobCancelled(Exception):
+    """Задача отменена (исключение выбрасывает хук, получивший запрос на отмену)."""
+
+
+def _alarm(signum, frame):
+    raise JobTimeout()
+
+
+def warm_worker():
+    """
+    Инициализатор процесса-исполнителя: заранее импортирует тяжёлые модули.
+
+    Первая задача в процессе не платит за импорт numpy, sympy и модулей
+    лабораторных, а обработчик SIGALRM прерывает задачи по таймауту. Ctrl+C
+    исполнители игнорируют: пул останавливает родительский процесс.
+    """
+    import sympy  # noqa: F401
+    import ScalarMinimizer  # noqa: F401
+    import Oracle  # noqa: F401
+    for module in VECTOR_METHODS.values():
+        __import__(module)
+    signal.signal(signal.SIGALRM, _alarm)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _solve(job, hook=None):
+    """
+    Выполняет одну задачу и возвращает словарь с результатом (без служебных полей).
+    """
+    method = job["method"]
+    objective = job["objective"]
+    options = dict(job.get("options", {}))
+    if hook is not None:
+        options["hook"] = hook
+    if method in SCALAR_METHODS:
+        from ExpressionEngine import compile_expression
+        from ScalarMinimizer import minimize_scalar
+        result = minimize_scalar(compile_expression(objective), list(job["interval"]), method,
+                                 job.get("epsilon", 1e-5), **options)
+        return {"x": float(result.x), "fun": float(result.fun), "iterations": int(result.iterations),
+                "evaluations": int(result.evaluations)}
+    if method in VECTOR_METHODS:
+        import numpy as np
+        from ExpressionEngine import compile_vector_expression
+        from Oracle import Oracle
+        f = compile_vector_expression(objective)
+        x_0 = np.array(job["x_0"], dtype=float)
+        gradient = job.get("gradient", "symbolic")
+        if gradient == "symbolic":
+            from AutoGrad import hessian, value_and_gradient
+            try:
+                # Производные строятся (результат кэшируется) и пробно вычисляются в x_0 здесь,
+                # чтобы выражение, которое sympy не может продифференцировать (например, с условием)
+                # или чьи производные не переводятся в numpy (DiracDelta от maximum), считалось численно
+                value_and_gradient(f, x_0.shape[0])(x_0)
+                hessian(f, x_0.shape[0])(x_0)
+            except Exception:
+                gradient = "central"
+        if gradient == "symbolic":
+            oracle = Oracle.from_expression(f, x_0.shape[0])
+        else:
+            # Численные производные: "forward", "central" или "complex" (без sympy)
+            oracle = Oracle.from_function(f, gradient, job.get("h"))
+        epsilon_1 = job.get("epsilon_1", 0.1)
+        epsilon_2 = job.get("epsilon_2", 0.15)
+        m = job.get("m", 10)
+        module = __import__(VECTOR_METHODS[method])
+        if method == "lbfgs":
+            x_min, f_min, k = module.lbfgs(oracle.value, oracle.grad, x_0, epsilon_1, epsilon_2, m, **options)
+        else:
+            unknown = sorted(set(options) - {"hook"})
+            if unknown:
+                raise ValueError(f"Метод {method} не принимает параметры options: {', '.join(unknown)}")
+            x_min, f_min, k = module.minimize(x_0, epsilon_1, epsilon_2, m, oracle=oracle, hook=hook)
+        return {"x": np.asarray(x_min, dtype=float).tolist(), "fun": float(f_min), "iterations": int(k),
+                "evaluations": {"f": oracle.nf, "grad": oracle.ng, "hessian": oracle.nh}}
+    raise ValueError(f"Неизвестный метод: {method}")
+
+
+def run_job(job, default_timeout=None, hook=None):
+    """
+    Выполняет задачу в процессе-исполнителе с ограничением по времени.
+
+    Args:
+        job (dict): Задача: id, method, objective, interval (для методов Laba1) или x_0
+            (для методов Laba2), точности и необязательные timeout, options и gradient
+            ("symbolic" или схема численного градиента для методов Laba2; если выражение
+            нельзя продифференцировать символьно, используется "central"). options передаются
+            методу; из методов Laba2 их принимает только lbfgs (history), для остальных
+            непустые options - ошибка.
+        default_timeout (float): Ограничение времени, если в задаче нет timeout.
+        hook: Хук метода (см. Service/Instrumentation.py); может прервать задачу, выбросив JobCancelled.
+
+    Returns:
+        dict: id, status ("ok", "error", "timeout" или "cancelled"), seconds и результат или текст ошибки.
+    """
+    timeout = job.get("timeout", default_timeout)
+    record = {"id": job.get("id"), "method": job.get("method")}
+    start = time.perf_counter()
+    try:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            record.update(_solve(job, hook))
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        record["status"] = "ok"
+    except JobTimeout:
+        record["status"] = "timeout"
+        record["error"] = f"Превышено время выполнения ({timeout} с)"
+    except JobCancelled:
+        record["status"] = "cancelled"
+    except Exception as error:
+        record["status"] = "error"
+        record["error"] = f"{type(error).__name__}: {error}"
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def read_jobs(lines):
+    """
+    Разбирает строки JSONL в задачи.
+
+    Некорректные строки не прерывают чтение: вместо задачи выдаётся готовая
+    запись об ошибке с номером строки.
+
+    Yields:
+        tuple: (задача, None) или (None, запись об ошибке).
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("задача должна быть объектом JSON")
+        except ValueError as error:
+            yield None, {"id": None, "line": number, "status": "error", "error": f"Некорректная строка: {error}"}
+            continue
+        job.setdefault("id", number)
+        yield job, None
+
+
+def run_batch(lines, output, workers=None, max_pending=None, timeout=None):
+    """
+    Выполняет задачи из строк JSONL в пуле процессов и пишет результаты по мере готовности.
+
+    Args:
+        lines: Итерируемый источник строк JSONL (файл или sys.stdin); читается лениво.
+        output: Файл, в который пишутся результаты (по одной строке JSON на задачу).
+        workers (int): Количество процессов (по умолчанию - по числу ядер).
+        max_pending (int): Сколько задач одновременно находится в пуле (по умолчанию 2 * workers).
+        timeout (float): Ограничение времени на задачу по умолчанию, с.
+
+    Returns:
+        dict: Количество задач по статусам.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    counts = {"ok": 0, "error": 0, "timeout": 0}
+
+    def emit(record):
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    def collect(pending, block):
+        done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            job = pending.pop(future)
+            try:
+                emit(future.result())
+            except Exception as error:
+                # Процесс-исполнитель упал (например, из-за нехватки памяти)
+                emit({"id": job.get("id"), "method": job.get("method"), "status": "error",
+                      "error": f"{type(error).__name__}: {error}"})
+
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_worker) as executor:
+        for job, failure in read_jobs(lines):
+            if failure is not None:
+                emit(failure)
+                continue
+            while len(pending) >= max_pending:
+                collect(pending, block=True)
+            pending[executor.submit(run_job, job, timeout)] = job
+            collect(pending, block=False)
+        while pending:
+            collect(pending, block=True)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетный запуск задач оптимизации из файла JSONL.")
+    parser.add_argument("jobs", nargs="?", default="-", help="Файл задач JSONL ('-' - стандартный ввод).")
+    parser.add_argument("--output", default="-", help="Файл результатов JSONL ('-' - стандартный вывод).")
+    parser.add_argument("--workers", type=int, default=None, help="Количество процессов.")
+    parser.add_argument("--max-pending", type=int, default=None, help="Максимум задач в пуле одновременно.")
+    parser.add_argument("--timeout", type=float, default=None, help="Ограничение времени на задачу, с.")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.jobs == "-" else open(args.jobs, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        counts = run_batch(source, output, args.workers, args.max_pending, args.timeout)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print("Итог: " + ", ".join(f"{status} - {count}" for status, count in counts.items()), file=sys.stderr)
+    sys.exit(0 if counts["error"] == 0 and counts["timeout"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
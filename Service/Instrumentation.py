@@ -0,0 +1,176 @@
+import json
+import math
+import os
+import time
+import tracemalloc
+
+
+class Recorder:
+    """
+    Хук для сбора метрик одного запуска метода оптимизации.
+
+    Методы Laba1 и Laba2 принимают необязательный параметр hook и, если он задан,
+    вызывают у него:
+        start(method)          - в начале запуска;
+        iteration(k, **values) - после каждой итерации (значения - числа, например
+                                 количество вычислений функции к этому моменту);
+        begin(section), end(section) - вокруг участков "line_search", "direction", "hessian";
+        finish(**summary)      - в конце запуска (итоговые счётчики).
+    Без хука (hook=None) методы выполняют только проверку `hook is not None`.
+
+    Attributes:
+        name (str): Имя запуска (метка run в экспорте).
+        trace_memory (bool): Измерять ли пиковую память через tracemalloc (заметно замедляет работу).
+        method (str): Имя метода из start().
+        iterations (list): Записи по итерациям: k, seconds (время итерации) и переданные значения.
+        sections (dict): Суммарное время по участкам, с.
+        summary (dict): Итоговые счётчики из finish(), seconds и peak_memory_bytes.
+    """
+
+    def __init__(self, name: str = None, trace_memory: bool = False):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.method = None
+        self.iterations = []
+        self.sections = {}
+        self.summary = {}
+        self._started = 0.0
+        self._last = 0.0
+        self._open = {}
+        self._owns_tracemalloc = False
+
+    def start(self, method: str):
+        self.method = method
+        self.iterations = []
+        self.sections = {}
+        self.summary = {}
+        self._open = {}
+        if self.trace_memory:
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._started = self._last = time.perf_counter()
+
+    def iteration(self, k: int, **values):
+        now = time.perf_counter()
+        record = {"k": k, "seconds": now - self._last}
+        record.update(values)
+        self.iterations.append(record)
+        self._last = now
+
+    def begin(self, section: str):
+        self._open[section] = time.perf_counter()
+
+    def end(self, section: str):
+        elapsed = time.perf_counter() - self._open.pop(section)
+        self.sections[section] = self.sections.get(section, 0.0) + elapsed
+
+    def finish(self, **summary):
+        self.summary = dict(summary)
+        self.summary["seconds"] = time.perf_counter() - self._started
+        if self.trace_memory:
+            self.summary["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+
+    def records(self):
+        """
+        Функция, которая возвращает записи запуска для экспорта в JSON lines
+        Return: генератор словарей: по одному на итерацию и итоговый с участками и счётчиками
+        """
+        labels = {"run": self.name, "method": self.method}
+        for record in self.iterations:
+            yield {**labels, "event": "iteration", **record}
+        yield {**labels, "event": "finish", "sections": self.sections, **self.summary}
+
+
+def write_jsonl(path: str, recorders, append: bool = True):
+    """
+    Функция, которая записывает метрики запусков в файл JSON lines
+    Args: path - путь к файлу; recorders - последовательность Recorder; append - дописывать ли в конец
+    Return: отсутствует
+    """
+    with open(path, "a" if append else "w", encoding="utf-8") as file:
+        for recorder in recorders:
+            for record in recorder.records():
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _escape(value) -> str:
+    """Экранирование значения метки Prometheus."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    """Метки метрики в формате Prometheus."""
+    text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items() if value is not None)
+    return "{" + text + "}" if text else ""
+
+
+def _value(value) -> str:
+    """Значение метрики в формате Prometheus (bool - как 0/1, бесконечности и nan - как +Inf, -Inf, NaN)."""
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+        # float() - чтобы np.float64 не записывался как "np.float64(...)"
+        return repr(float(value))
+    return str(value)
+
+
+_METRICS = (
+    ("optimization_run_seconds", "Wall time of an optimization run."),
+    ("optimization_iterations", "Number of iterations of an optimization run."),
+    ("optimization_iteration_seconds_max", "Slowest iteration of an optimization run."),
+    ("optimization_section_seconds", "Time spent in a section (line_search, direction, hessian)."),
+    ("optimization_evaluations", "Evaluation counters reported by the method."),
+    ("optimization_peak_memory_bytes", "Peak traced memory during an optimization run."),
+)
+
+
+def write_prometheus(path: str, recorders):
+    """
+    Функция, которая записывает метрики запусков в текстовый файл для Prometheus (textfile collector)
+    Args: path - путь к файлу .prom; recorders - последовательность Recorder (запуску без имени
+          метка run ставится по его номеру в последовательности)
+    Return: отсутствует (файл заменяется атомарно, чтобы сборщик не прочитал его наполовину)
+    Raises: ValueError, если у двух запусков совпадают метки run и method (Prometheus
+            отбросил бы такие повторяющиеся ряды)
+    """
+    samples = {name: [] for name, _ in _METRICS}
+    seen = set()
+    for index, recorder in enumerate(recorders):
+        base = {"run": recorder.name if recorder.name is not None else str(index), "method": recorder.method}
+        if (base["run"], base["method"]) in seen:
+            raise ValueError(f"Повторяются метки run={base['run']!r}, method={base['method']!r}: "
+                             f"задайте запускам разные имена")
+        seen.add((base["run"], base["method"]))
+        summary = recorder.summary
+        samples["optimization_run_seconds"].append((_labels(**base), summary.get("seconds", 0.0)))
+        iterations = summary.get("iterations", len(recorder.iterations))
+        samples["optimization_iterations"].append((_labels(**base), iterations))
+        slowest = max((record["seconds"] for record in recorder.iterations), default=0.0)
+        samples["optimization_iteration_seconds_max"].append((_labels(**base), slowest))
+        for section, seconds in sorted(recorder.sections.items()):
+            samples["optimization_section_seconds"].append((_labels(**base, section=section), seconds))
+        for kind, value in sorted(summary.items()):
+            # bool - подкласс int, но флаги (например converged) - не счётчики вычислений
+            if (kind not in ("seconds", "iterations", "peak_memory_bytes") and isinstance(value, (int, float))
+                    and not isinstance(value, bool)):
+                samples["optimization_evaluations"].append((_labels(**base, kind=kind), value))
+        if "peak_memory_bytes" in summary:
+            samples["optimization_peak_memory_bytes"].append((_labels(**base), summary["peak_memory_bytes"]))
+
+    lines = []
+    for name, help_text in _METRICS:
+        if samples[name]:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{labels} {_value(value)}" for labels, value in samples[name])
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    os.replace(temporary, path)
@@ -0,0 +1,357 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.managers import SyncManager
+
+from BatchRunner import JobCancelled, run_job, warm_worker
+
+# Состояния задачи; после DONE_STATES состояние больше не меняется
+DONE_STATES = ("ok", "error", "timeout", "cancelled")
+
+
+class ProgressHook:
+    """
+    Хук, который передаёт ход метода из процесса-исполнителя серверу и прерывает отменённую задачу.
+
+    Очередь и событие - объекты multiprocessing.Manager, поэтому хук передаётся в процесс
+    вместе с задачей. Отмена проверяется при запуске метода и на каждой итерации, чтобы
+    прервать и короткую задачу; прогресс (межпроцессная запись в очередь) отправляется
+    не чаще одного раза в interval секунд.
+
+    Attributes:
+        job_id (str): Идентификатор задачи.
+        queue: Очередь прогресса сервера (элементы - (job_id, k, values)).
+        cancel: Событие отмены задачи.
+        interval (float): Минимальный промежуток между отправками прогресса, с.
+    """
+
+    def __init__(self, job_id, queue, cancel, interval=0.1):
+        self.job_id = job_id
+        self.queue = queue
+        self.cancel = cancel
+        self.interval = interval
+        self._last = 0.0
+
+    def __getstate__(self):
+        return self.job_id, self.queue, self.cancel, self.interval
+
+    def __setstate__(self, state):
+        self.job_id, self.queue, self.cancel, self.interval = state
+        self._last = 0.0
+
+    def start(self, method):
+        if self.cancel.is_set():
+            raise JobCancelled()
+        self._last = time.monotonic()
+
+    def iteration(self, k, **values):
+        if self.cancel.is_set():
+            raise JobCancelled()
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return
+        self._last = now
+        # Значения numpy (np.float64 и т.п.) приводятся к числам Python для JSON
+        values = {key: value.item() if hasattr(value, "item") else value for key, value in values.items()}
+        self.queue.put((self.job_id, k, values))
+
+    def begin(self, section):
+        pass
+
+    def end(self, section):
+        pass
+
+    def finish(self, **summary):
+        pass
+
+
+def _ignore_interrupt():
+    """Инициализатор процесса менеджера: Ctrl+C обрабатывает только сервер."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class Job:
+    """
+    Задача на сервере.
+
+    Attributes:
+        id (str): Идентификатор задачи.
+        spec (dict): Описание задачи в формате BatchRunner.
+        state (str): "queued", "running" или одно из DONE_STATES.
+        progress (deque): Последние записи прогресса {"k": ..., **values}.
+        result (dict): Результат run_job или None.
+        cancel: Событие отмены (multiprocessing.Manager().Event()).
+        subscribers (list): Очереди клиентов, подписанных командой stream.
+    """
+
+    def __init__(self, job_id, spec, cancel, history=100):
+        self.id = job_id
+        self.spec = spec
+        self.state = "queued"
+        self.progress = deque(maxlen=history)
+        self.result = None
+        self.cancel = cancel
+        self.subscribers = []
+
+    def publish(self, event):
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(event)
+
+    def status(self):
+        return {"id": self.id, "state": self.state,
+                "progress": self.progress[-1] if self.progress else None, "result": self.result}
+
+
+class JobServer:
+    """
+    Асинхронный сервер задач оптимизации поверх пула процессов BatchRunner.
+
+    Протокол - JSON lines: клиент отправляет по одной команде в строке, сервер отвечает
+    по одной строке на команду (для stream - строками событий до завершения задачи):
+        {"command": "submit", "job": {...}} -> {"ok": true, "id": ...}
+        {"command": "status", "id": ...}    -> {"ok": true, "id", "state", "progress", "result"}
+        {"command": "stream", "id": ...}    -> {"event": "progress", ...}, ..., {"event": "done", ...}
+        {"command": "cancel", "id": ...}    -> {"ok": true, "id", "state"}
+    Ошибки возвращаются как {"ok": false, "error": ...}; при заполненной очереди submit
+    отклоняется с "queue_full", и клиент должен повторить попытку позже.
+
+    Attributes:
+        workers (int): Количество процессов в пуле.
+        max_running (int): Сколько задач выполняется одновременно.
+        max_queued (int): Сколько задач может ждать в очереди.
+        timeout (float): Ограничение времени на задачу по умолчанию, с.
+        keep (int): Сколько завершённых задач хранится для status.
+    """
+
+    def __init__(self, workers=None, max_running=None, max_queued=100, timeout=None, keep=1000):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_running = max_running or self.workers
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.keep = keep
+        self.jobs = {}
+        self._finished = deque()
+        self._ids = itertools.count(1)
+        self._queue = None
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._tasks = []
+
+    async def start(self):
+        """
+        Запускает пул процессов, диспетчеры задач и приём прогресса.
+
+        Все процессы пула создаются и прогреваются сразу, чтобы первые задачи
+        не ждали импорта numpy и sympy.
+        """
+        loop = asyncio.get_running_loop()
+        self._manager = SyncManager()
+        self._manager.start(_ignore_interrupt)
+        self._progress = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        await asyncio.gather(*(loop.run_in_executor(self._executor, os.getpid) for _ in range(self.workers)))
+        self._queue = asyncio.Queue(self.max_queued)
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.max_running)]
+        self._tasks.append(asyncio.create_task(self._receive_progress()))
+
+    async def close(self):
+        """
+        Останавливает диспетчеры, пул процессов и менеджер.
+        """
+        for job in self.jobs.values():
+            if job.state not in DONE_STATES:
+                job.cancel.set()
+        self._progress.put(None)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._manager.shutdown()
+
+    def submit(self, spec):
+        """
+        Ставит задачу в очередь.
+
+        Returns:
+            Job: Созданная задача.
+
+        Raises:
+            asyncio.QueueFull: Очередь заполнена.
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("задача должна быть объектом JSON")
+        if self._queue.full():
+            raise asyncio.QueueFull()
+        job_id = str(next(self._ids))
+        job = Job(job_id, dict(spec, id=job_id), self._manager.Event())
+        self._queue.put_nowait(job)
+        self.jobs[job_id] = job
+        return job
+
+    def cancel(self, job):
+        """
+        Отменяет задачу: ожидающая снимается сразу, выполняющаяся прерывается на ближайшей итерации.
+        """
+        if job.state == "queued":
+            self._complete(job, {"id": job.id, "method": job.spec.get("method"), "status": "cancelled"})
+        elif job.state == "running":
+            job.cancel.set()
+
+    def _complete(self, job, result):
+        job.result = result
+        job.state = result["status"]
+        job.publish({"event": "done", **job.status()})
+        self._finished.append(job.id)
+        while len(self._finished) > self.keep:
+            self.jobs.pop(self._finished.popleft(), None)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            if job.state != "queued":
+                # Задача отменена, пока ждала в очереди
+                continue
+            job.state = "running"
+            job.publish({"event": "running", "id": job.id})
+            hook = ProgressHook(job.id, self._progress, job.cancel)
+            try:
+                result = await loop.run_in_executor(self._executor, run_job, job.spec, self.timeout, hook)
+            except Exception as error:
+                # Процесс-исполнитель упал
+                result = {"id": job.id, "method": job.spec.get("method"), "status": "error",
+                          "error": f"{type(error).__name__}: {error}"}
+            self._complete(job, result)
+
+    async def _receive_progress(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(None, self._progress.get)
+            if item is None:
+                return
+            job_id, k, values = item
+            job = self.jobs.get(job_id)
+            if job is not None and job.state == "running":
+                record = {"k": k, **values}
+                job.progress.append(record)
+                job.publish({"event": "progress", "id": job_id, **record})
+
+    async def handle(self, reader, writer):
+        """
+        Обслуживает одно подключение клиента.
+        """
+        async def send(message):
+            writer.write((json.dumps(message, ensure_ascii=False) + "\n").encode())
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    command = request["command"]
+                except (ValueError, KeyError, TypeError):
+                    await send({"ok": False, "error": "bad_request"})
+                    continue
+                if command == "submit":
+                    try:
+                        job = self.submit(request.get("job"))
+                    except asyncio.QueueFull:
+                        await send({"ok": False, "error": "queue_full"})
+                    except ValueError as error:
+                        await send({"ok": False, "error": str(error)})
+                    else:
+                        await send({"ok": True, "id": job.id})
+                    continue
+                job = self.jobs.get(str(request.get("id")))
+                if job is None:
+                    await send({"ok": False, "error": "unknown_job"})
+                elif command == "status":
+                    await send({"ok": True, **job.status()})
+                elif command == "cancel":
+                    self.cancel(job)
+                    await send({"ok": True, "id": job.id, "state": job.state})
+                elif command == "stream":
+                    await self._stream(job, send)
+                else:
+                    await send({"ok": False, "error": f"unknown_command: {command}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Клиент отключился
+            pass
+        finally:
+            # При остановке сервера (CancelledError) соединение тоже закрывается, а отмена идёт дальше
+            writer.close()
+
+    async def _stream(self, job, send):
+        if job.state in DONE_STATES:
+            await send({"event": "done", **job.status()})
+            return
+        events = asyncio.Queue()
+        job.subscribers.append(events)
+        try:
+            await send({"event": job.state, "id": job.id})
+            while True:
+                event = await events.get()
+                await send(event)
+                if event["event"] == "done":
+                    return
+        finally:
+            job.subscribers.remove(events)
+
+
+async def serve(server, unix=None, host="127.0.0.1", port=8765):
+    """
+    Запускает сервер на Unix-сокете (если задан unix) или на TCP-порту и работает до отмены.
+    """
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    connections = set()
+
+    def connected(reader, writer):
+        # Задачи подключений создаются здесь, а не в asyncio, чтобы при остановке их отменить и дождаться
+        task = asyncio.create_task(server.handle(reader, writer))
+        connections.add(task)
+        task.add_done_callback(connections.discard)
+
+    await server.start()
+    try:
+        if unix is not None:
+            listener = await asyncio.start_unix_server(connected, path=unix)
+        else:
+            listener = await asyncio.start_server(connected, host, port)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+        if unix is not None and os.path.exists(unix):
+            os.unlink(unix)
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер задач оптимизации (JSON lines).")
+    parser.add_argument("--unix", default=None, help="Путь к Unix-сокету (вместо TCP).")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для TCP.")
+    parser.add_argument("--port", type=int, default=8765, help="Порт для TCP.")
+    parser.add_argument("--workers", type=int, default=None, help="Количество процессов.")
+    parser.add_argument("--max-running", type=int, default=None, help="Сколько задач выполняется одновременно.")
+    parser.add_argument("--max-queued", type=int, default=100, help="Сколько задач может ждать в очереди.")
+    parser.add_argument("--timeout", type=float, default=None, help="Ограничение времени на задачу, с.")
+    args = parser.parse_args()
+
+    server = JobServer(args.workers, args.max_running, args.max_queued, args.timeout)
+    try:
+        asyncio.run(serve(server, args.unix, args.host, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()